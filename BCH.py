@@ -0,0 +1,169 @@
+from functools import lru_cache
+
+import Calculations as calc
+from GaloisFields import make_GF
+from Polynomials import BinaryPolynomial, polynomial_from_roots
+
+# Cosets, minimal polynomials and generators are cached per field, so sweeping t only computes what's new
+
+@lru_cache(maxsize=None)
+def cyclotomic_coset(m:int,i:int) -> tuple[int,...]:
+    """
+    Cyclotomic coset of i mod 2^m - 1: {i, 2i, 4i, ...}
+    :param m: Bits per symbol of GF(2^m)
+    :param i: Any exponent
+    :return: Sorted exponents, the first one is the coset leader
+    """
+    n = (1 << m) - 1
+    coset = {i % n}
+    exponent = (2 * i) % n
+    while exponent not in coset:
+        coset.add(exponent)
+        exponent = (2 * exponent) % n
+    return tuple(sorted(coset))
+
+@lru_cache(maxsize=None)
+def cyclotomic_cosets(m:int) -> list[tuple[int,...]]:
+    """
+    All cyclotomic cosets mod 2^m - 1, ordered by their leader
+    :param m:
+    :return:
+    """
+    n = (1 << m) - 1
+    seen = bytearray(n)
+    cosets = []
+    for i in range(n):
+        if not seen[i]:
+            coset = cyclotomic_coset(m,i)
+            for j in coset:
+                seen[j] = 1
+            cosets.append(coset)
+    return cosets
+
+@lru_cache(maxsize=None)
+def minimal_polynomial(m:int,i:int) -> BinaryPolynomial:
+    """
+    Minimal polynomial of alpha^i over GF1 (alpha being the primitive element of make_GF(m))
+    :param m:
+    :param i:
+    :return:
+    """
+    field = make_GF(m)
+    alpha = field.alpha()
+    product = polynomial_from_roots(*[alpha ** j for j in cyclotomic_coset(m,i)],map_type=field)
+    assert all(v in (0,1) for v in product.vals), "Minimal polynomial has to be binary"
+    return BinaryPolynomial(product.vals)
+
+# (m, first_root) -> (generators for t = 0, 1, ..., coset leaders of the roots so far)
+_generators:dict[tuple[int,int],tuple[list[BinaryPolynomial],set[int]]] = dict()
+# m -> bch_parity_count(m, t) for all t calculated so far
+_parity_counts:dict[int,list[int]] = dict()
+
+def bch_generator(m:int,t:int,first_root:int = 1) -> BinaryPolynomial:
+    """
+    Generator polynomial of the binary BCH code of length 2^m - 1 and designed distance 2t + 1:
+    LCM of the minimal polynomials of alpha^first_root ... alpha^(first_root + 2t - 1).
+    Built from the one for t - 1, since only the cosets of the two new roots can be new,
+    so sweeping t multiplies in each minimal polynomial once.
+    :param m:
+    :param t: Correctable bit errors (designed)
+    :param first_root: Exponent of the first root, 1 for narrow-sense codes
+    :return:
+    """
+    assert t >= 0, "t can't be negative"
+    if 2 * t + 1 > (1 << m) - 1:
+        raise ValueError(f"There is no BCH code with m={m} and t={t}")
+
+    generators, leaders = _generators.setdefault((m,first_root),([BinaryPolynomial(1)],set()))
+    while len(generators) <= t:
+        generator = generators[-1]
+        root = first_root + 2 * len(generators) - 2
+        for leader in (cyclotomic_coset(m,root)[0],cyclotomic_coset(m,root + 1)[0]):
+            if leader not in leaders:
+                leaders.add(leader)
+                generator = generator * minimal_polynomial(m,leader)
+        generators.append(generator)
+    return generators[t]
+
+def bch_parity_count(m:int,t:int) -> int:
+    """
+    n - k of bch_generator(m, t), but only from the coset sizes, without building any polynomial
+    :param m:
+    :param t: Correctable bit errors (designed)
+    :return: Grade of the generator polynomial
+    """
+    assert t >= 0, "t can't be negative"
+    if 2 * t + 1 > (1 << m) - 1:
+        raise ValueError(f"There is no BCH code with m={m} and t={t}")
+
+    counts = _parity_counts.setdefault(m,[0])
+    for i in range(2 * len(counts) - 1,2 * t,2):
+        coset = cyclotomic_coset(m,i)
+        counts.append(counts[-1] + len(coset) * (coset[0] == i))
+    return counts[t]
+
+class BCHCode:
+    """
+    Narrow-sense binary BCH code, designed from m and t.
+    The parameters plug directly into the analysis of Calculations, with symbols being bits.
+    """
+
+    def __init__(self,m:int,t:int):
+        """
+        :param m: Codewords are 2^m - 1 bits long
+        :param t: Correctable bit errors (designed)
+        """
+        assert 2 <= m <= 16, "Only m from 2 to 16 is supported"
+        self.m = m
+        self.t = t
+        self.generator:BinaryPolynomial = bch_generator(m,t)
+        self.n = (1 << m) - 1
+        self.k = self.n - self.generator.grade
+
+    def __repr__(self):
+        return f"BCHCode(n={self.n}, k={self.k}, t={self.t})"
+
+    @property
+    def rate(self) -> float:
+        return self.k / self.n
+
+    def get_table(self,bit_error_rate:float,k_max:int = None,**kwargs) -> list[list]:
+        """
+        Calculations.get_table for one codeword of this code
+        :param bit_error_rate: Single bit error probability
+        :param k_max: Last k of the table, 2t if not given
+        :param kwargs: Passed to get_table
+        :return:
+        """
+        if k_max is None:
+            k_max = 2 * self.t
+        return calc.get_table(bit_error_rate,self.n,k_max,**kwargs)
+
+    def failure_rate(self,bit_error_rate:float) -> float:
+        """
+        Probability that a codeword has more errors than the code can correct
+        :param bit_error_rate: Single bit error probability
+        :return: P(> t)
+        """
+        return calc.probability_more_than(bit_error_rate,self.n,self.t)
+
+def design_sweep(m:int,t_max:int) -> list[BCHCode]:
+    """
+    All BCH codes of length 2^m - 1 for t = 1 ... t_max.
+    If several t share the same generator, only the largest t is kept, e.g. (15, 1, 7) instead of (15, 1, 4) ... (15, 1, 7).
+    :param m:
+    :param t_max:
+    :return:
+    """
+    codes = []
+    for t in range(1,t_max + 1):
+        try:
+            code = BCHCode(m,t)
+        except ValueError:
+            break
+
+        if codes and codes[-1].k == code.k:
+            codes[-1] = code
+        else:
+            codes.append(code)
+    return codes
@@ -0,0 +1,324 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Cold-start budget in ms for importing a module in a fresh interpreter (numpy alone takes most of it)
+IMPORT_BUDGETS = {
+    "GaloisFields": 100,
+    "Polynomials": 100,
+    "Calculations": 100,
+    "BCH": 100,
+    "CRC": 100,
+    "ReedSolomon": 100,
+    "Simulation": 100,
+    "ConvolutionalCodes": 100,
+}
+
+# These must only be imported when they are actually used
+LAZY_MODULES = ("scipy","FreeSimpleGUI","matplotlib")
+
+_IMPORT_CODE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000)
+print(",".join(m for m in {lazy!r} if m in sys.modules))
+"""
+
+def import_time(module:str,repeat:int = 5) -> tuple[float,list[str]]:
+    """
+    Imports module in fresh interpreters
+    :param module:
+    :param repeat: Best of how many runs
+    :return: Fastest import time in ms, lazy modules that were loaded anyway
+    """
+    best = float("inf")
+    loaded = list()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable,"-c",_IMPORT_CODE.format(module=module,lazy=LAZY_MODULES)],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.splitlines()
+        best = min(best,float(output[0]))
+        loaded = [i for i in output[1].split(",") if i]
+    return best, loaded
+
+def check_import_budgets(budgets:dict[str,float] = None) -> bool:
+    """
+    Prints the import time of every module and whether it's within its budget
+    :param budgets: module -> ms
+    :return: True, if all are within budget and no lazy module was imported
+    """
+    if budgets is None:
+        budgets = IMPORT_BUDGETS
+
+    ok = True
+    for module,budget in budgets.items():
+        ms, loaded = import_time(module)
+        passed = ms <= budget and not loaded
+        ok &= passed
+        print(f"{module:<20}{ms:8.1f} ms  (budget {budget} ms)  {'ok' if passed else 'FAILED'}" + (f"  loaded {', '.join(loaded)}" if loaded else ""))
+    return ok
+
+SEED = 1234
+MIN_TIME = 0.2 # Seconds per measurement, short workloads are repeated until they take that long
+REPEAT = 3 # The best of that many measurements counts
+# Machine specific, so it's kept in the user's cache directory, outside of the repository
+BASELINE_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"),".cache"),
+    "ChannelCodingUtility",
+    "benchmark_baseline.json",
+)
+MEMORY_MAX_TIME = 0.25 # tracemalloc slows pure Python code down a lot (40x and more), so longer runs skip it
+
+# name -> (sizes, setup), setup(size) returns (run, elements).
+# run() is what's measured, elements is how many "things" one run handles (for the time per element).
+BENCHMARKS:dict[str,tuple[tuple,callable]] = dict()
+
+def benchmark(name:str,sizes:tuple):
+    """
+    Decorator to register a setup function as benchmark
+    :param name:
+    :param sizes: The setup function is called once per size
+    :return:
+    """
+    def register(setup:callable) -> callable:
+        BENCHMARKS[name] = (sizes,setup)
+        return setup
+    return register
+
+def _rng():
+    import numpy as np
+    return np.random.default_rng(SEED)
+
+@benchmark("GF8.__mul__",(1_000,100_000))
+def _gf8_mul(size:int):
+    from GaloisFields import GF8
+    a = [GF8(int(i)) for i in _rng().integers(0,256,size)]
+    b = a[::-1]
+    def run():
+        for x,y in zip(a,b):
+            x * y
+    return run, size
+
+@benchmark("GFArray multiply",(1_000,100_000,10_000_000))
+def _gfarray_mul(size:int):
+    from GaloisFields import GF8, GFArray
+    a = GFArray(_rng().integers(0,256,size),GF8)
+    b = a[::-1].copy()
+    return (lambda:a * b), size
+
+def _gf8_polynomial(grade:int,rng) -> "Polynomial":
+    from GaloisFields import GF8
+    from Polynomials import Polynomial
+    return Polynomial(*rng.integers(1,256,grade + 1).tolist(),map_type=GF8)
+
+@benchmark("Polynomial.__mul__",(16,256,4096))
+def _poly_mul(size:int):
+    rng = _rng()
+    a, b = _gf8_polynomial(size,rng), _gf8_polynomial(size,rng)
+    return (lambda:a * b), size
+
+@benchmark("Polynomial.__divmod__",(16,256,4096))
+def _poly_divmod(size:int):
+    rng = _rng()
+    a, b = _gf8_polynomial(2 * size,rng), _gf8_polynomial(size,rng)
+    return (lambda:divmod(a,b)), size
+
+@benchmark("Polynomial.__pow__ (mod)",(16,256,1024)) # 4096 takes about 15 s per call
+def _poly_pow(size:int):
+    rng = _rng()
+    a, modulo = _gf8_polynomial(size - 1,rng), _gf8_polynomial(size,rng)
+    return (lambda:pow(a,1 << 16,modulo)), size
+
+@benchmark("polynomial_from_roots",(16,256,4096))
+def _from_roots(size:int):
+    from GaloisFields import make_GF
+    from Polynomials import polynomial_from_roots
+    field = make_GF(16)
+    roots = [field(int(i)) for i in _rng().integers(1,field.order,size)]
+    return (lambda:polynomial_from_roots(*roots,map_type=field)), size
+
+@benchmark("poly_xgcd",(64,256,1024))
+def _poly_xgcd(size:int):
+    from GaloisFields import make_GF
+    from Polynomials import Polynomial, poly_xgcd
+    rng = _rng()
+    field = make_GF(16)
+    a = Polynomial(*rng.integers(1,field.order,size + 1).tolist(),map_type=field)
+    b = Polynomial(*rng.integers(1,field.order,size).tolist(),map_type=field)
+    return (lambda:poly_xgcd(a,b)), size
+
+@benchmark("poly_mod CRC loop",(1_000,100_000))
+def _poly_mod(size:int):
+    from importlib import import_module
+    poly_mod = import_module("polynomdivision_array_fürC").poly_mod
+    data = _rng().integers(0,256,size).tolist()
+    def run():
+        mod = data[0]
+        for i in data[1:]:
+            mod = poly_mod(((mod << 8) + i) & 0xffff,0b10000111)
+        return mod
+    return run, size
+
+@benchmark("CRC-32 compute",(1_000,100_000,10_000_000))
+def _crc(size:int):
+    from CRC import CRC
+    crc = CRC.from_name("CRC-32")
+    data = _rng().integers(0,256,size,dtype="uint8").tobytes()
+    return (lambda:crc.compute(data)), size
+
+@benchmark("get_table (k_max 64)",(1_000,1_000_000,1_000_000_000))
+def _get_table(size:int):
+    import Calculations as calc
+    def run():
+        calc.clear_cache()
+        calc.get_table(10 / size,size,64)
+    return run, 65
+
+@benchmark("sweep 100x100x64",(1,))
+def _sweep(size:int):
+    import numpy as np
+    import Calculations as calc
+    return (lambda:calc.sweep(np.logspace(-9,-1,100),np.logspace(3,9,100).round(),np.arange(64))), 100 * 100 * 64
+
+@benchmark("Viterbi K=7 (frames x 1000 bits)",(10,100,1_000))
+def _viterbi(size:int):
+    from ConvolutionalCodes import ConvEncoder, ViterbiDecoder
+    received = ConvEncoder().encode(_rng().integers(0,2,(size,1000)))
+    decoder = ViterbiDecoder()
+    return (lambda:decoder.decode(received)), size * 1000
+
+@benchmark("Viterbi K=7 single frame",(1_000,100_000))
+def _viterbi_single(size:int):
+    from ConvolutionalCodes import ConvEncoder, ViterbiDecoder
+    received = ConvEncoder().encode(_rng().integers(0,2,size))
+    decoder = ViterbiDecoder()
+    return (lambda:decoder.decode(received)), size
+
+def measure(run:callable) -> tuple[float,int|None]:
+    """
+    :param run:
+    :return: Best time per call in seconds, peak memory of one call in bytes (None if it would take too long)
+    """
+    run() # Warm up (caches, lazy imports)
+
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        took = time.perf_counter() - start
+        if took >= MIN_TIME:
+            break
+        calls *= max(2,min(10,int(MIN_TIME / max(took,1e-9)) + 1))
+
+    best = took / calls
+    for _ in range(REPEAT - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        best = min(best,(time.perf_counter() - start) / calls)
+
+    if best > MEMORY_MAX_TIME:
+        return best, None
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def run_benchmarks(name_filter:str = "") -> dict[str,dict]:
+    """
+    Runs every registered benchmark (whose name contains name_filter) for all its sizes
+    :param name_filter:
+    :return: "name [size]" -> ops_per_s, s_per_element, peak_bytes
+    """
+    results = dict()
+    for name,(sizes,setup) in BENCHMARKS.items():
+        if name_filter.lower() not in name.lower():
+            continue
+        for size in sizes:
+            run, elements = setup(size)
+            seconds, peak = measure(run)
+            key = f"{name} [{size:_}]"
+            results[key] = {
+                "ops_per_s": 1 / seconds,
+                "s_per_element": seconds / elements,
+                "peak_bytes": peak,
+            }
+            memory = "-" if peak is None else f"{peak / 2 ** 20:.2f}"
+            print(f"{key:<42}{1 / seconds:14.2f} ops/s{seconds / elements * 1e9:14.2f} ns/element{memory:>10} MiB")
+    return results
+
+def compare(results:dict[str,dict],baseline:dict[str,dict],tolerance:float) -> list[str]:
+    """
+    :param results:
+    :param baseline: Results of an earlier run
+    :param tolerance: How much slower than the baseline is still fine, 0.25 means 25 %
+    :return: Descriptions of all regressions
+    """
+    regressions = list()
+    for key,result in results.items():
+        if key not in baseline:
+            continue
+        ratio = result["s_per_element"] / baseline[key]["s_per_element"]
+        print(f"{key:<42}{ratio:8.2f} x baseline time")
+        if ratio > 1 + tolerance:
+            regressions.append(f"{key}: {ratio:.2f} x slower")
+    return regressions
+
+def save_results(path:str,results:dict[str,dict]):
+    import numpy as np
+    os.makedirs(os.path.dirname(os.path.abspath(path)),exist_ok=True)
+    with open(path,"w") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "seed": SEED,
+            "results": results,
+        },f,indent=2)
+
+def main(argv:list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks the hot paths and checks the import times")
+    parser.add_argument("-k","--filter",default="",help="Only run benchmarks whose name contains this")
+    parser.add_argument("-s","--save",help="Save the results as JSON to this file")
+    parser.add_argument("-b","--baseline",default=BASELINE_FILE,help="Compare against results saved earlier (default: the stored baseline, if there is one)")
+    parser.add_argument("-u","--update-baseline",action="store_true",help="Store the results as new baseline")
+    parser.add_argument("-t","--tolerance",type=float,default=0.25,help="Allowed slowdown against the baseline")
+    parser.add_argument("--skip-imports",action="store_true",help="Don't check the import-time budgets")
+    args = parser.parse_args(argv)
+
+    ok = True
+    if not args.skip_imports:
+        ok = check_import_budgets()
+        print()
+
+    results = run_benchmarks(args.filter)
+
+    for path in [args.save] + [BASELINE_FILE] * args.update_baseline:
+        if path:
+            save_results(path,results)
+
+    if args.baseline and os.path.exists(args.baseline) and not args.update_baseline:
+        print()
+        with open(args.baseline) as f:
+            regressions = compare(results,json.load(f)["results"],args.tolerance)
+        for i in regressions:
+            print("REGRESSION",i)
+        ok &= not regressions
+
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
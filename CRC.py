@@ -0,0 +1,548 @@
+from functools import lru_cache
+import mmap
+import os
+
+import numpy as np
+
+# Parameters of common CRCs (like in the usual CRC catalogues). poly is written without the x^width term.
+CRC_PRESETS = {
+    "CRC-3/GSM":        dict(width=3,  poly=0x3,                init=0x0,                refin=False, refout=False, xorout=0x7),
+    "CRC-5/USB":        dict(width=5,  poly=0x05,               init=0x1f,               refin=True,  refout=True,  xorout=0x1f),
+    "CRC-7/MMC":        dict(width=7,  poly=0x09,               init=0x0,                refin=False, refout=False, xorout=0x0),
+    "CRC-8":            dict(width=8,  poly=0x07,               init=0x0,                refin=False, refout=False, xorout=0x0),
+    "CRC-8/MAXIM":      dict(width=8,  poly=0x31,               init=0x0,                refin=True,  refout=True,  xorout=0x0),
+    "CRC-10/ATM":       dict(width=10, poly=0x233,              init=0x0,                refin=False, refout=False, xorout=0x0),
+    "CRC-12/UMTS":      dict(width=12, poly=0x80f,              init=0x0,                refin=False, refout=True,  xorout=0x0),
+    "CRC-16/ARC":       dict(width=16, poly=0x8005,             init=0x0,                refin=True,  refout=True,  xorout=0x0),
+    "CRC-16/CCITT":     dict(width=16, poly=0x1021,             init=0xffff,             refin=False, refout=False, xorout=0x0),
+    "CRC-16/KERMIT":    dict(width=16, poly=0x1021,             init=0x0,                refin=True,  refout=True,  xorout=0x0),
+    "CRC-24/OPENPGP":   dict(width=24, poly=0x864cfb,           init=0xb704ce,           refin=False, refout=False, xorout=0x0),
+    "CRC-32":           dict(width=32, poly=0x04c11db7,         init=0xffffffff,         refin=True,  refout=True,  xorout=0xffffffff),
+    "CRC-32C":          dict(width=32, poly=0x1edc6f41,         init=0xffffffff,         refin=True,  refout=True,  xorout=0xffffffff),
+    "CRC-32/BZIP2":     dict(width=32, poly=0x04c11db7,         init=0xffffffff,         refin=False, refout=False, xorout=0xffffffff),
+    "CRC-64/ECMA-182":  dict(width=64, poly=0x42f0e1eba9ea3693, init=0x0,                refin=False, refout=False, xorout=0x0),
+    "CRC-64/XZ":        dict(width=64, poly=0x42f0e1eba9ea3693, init=0xffffffffffffffff, refin=True,  refout=True,  xorout=0xffffffffffffffff),
+}
+
+KERNELS = ("bytewise","slice4","slice8","numpy")
+
+# Inputs of at least this many bytes use the numpy kernel if kernel="auto"
+NUMPY_THRESHOLD = 1 << 16
+# The numpy kernel works on segments of this size and splits each one into NUMPY_BLOCKS blocks
+NUMPY_SEGMENT = 1 << 24
+NUMPY_BLOCKS = 8192
+
+def reflect(value:int,width:int) -> int:
+    """
+    Mirrors the lowest width bits of value
+    :param value:
+    :param width:
+    :return:
+    """
+    return int(format(value,f"0{width}b")[::-1],2)
+
+@lru_cache(maxsize=None)
+def _tables(width:int,poly:int,reflected:bool,count:int) -> tuple[list[int],...]:
+    """
+    Lookup tables for the register of a table-driven CRC.
+    Table k holds the register after one byte followed by k zero-bytes.
+
+    In reflected mode, the register is mirrored and sits in the lowest width bits.
+    Otherwise, it is aligned to the top of max(width,8) bits.
+    :param count: How many tables, 1 for bytewise, 4 for slicing-by-4, ...
+    :return: count lists of 256 registers
+    """
+    if reflected:
+        reflected_poly = reflect(poly,width)
+        first = []
+        for i in range(256):
+            register = i
+            for _ in range(8):
+                register = (register >> 1) ^ reflected_poly if register & 1 else register >> 1
+            first.append(register)
+    else:
+        register_width = max(width,8)
+        aligned_poly = poly << (register_width - width)
+        top_bit = 1 << (register_width - 1)
+        mask = (1 << register_width) - 1
+        first = []
+        for i in range(256):
+            register = i << (register_width - 8)
+            for _ in range(8):
+                register = ((register << 1) ^ aligned_poly if register & top_bit else register << 1) & mask
+            first.append(register)
+
+    tables = [first]
+    for _ in range(count - 1): # Push each entry through one more zero-byte
+        previous = tables[-1]
+        if reflected:
+            tables.append([first[i & 0xff] ^ (i >> 8) for i in previous])
+        else:
+            tables.append([first[i >> (register_width - 8)] ^ ((i << 8) & mask) for i in previous])
+
+    return tuple(tables)
+
+@lru_cache(maxsize=None)
+def _np_tables(width:int,poly:int,reflected:bool) -> np.ndarray:
+    """
+    Slicing-by-8 tables as (8,256)-array
+    """
+    return np.array(_tables(width,poly,reflected,8),dtype=np.uint64)
+
+def _matrix_apply(columns:list[int],vector:int) -> int:
+    """
+    Multiplies a GF(2)-matrix with a vector
+    :param columns: Column i is the image of bit i
+    :param vector: Bitmask
+    :return: Bitmask
+    """
+    answer = 0
+    i = 0
+    while vector:
+        if vector & 1:
+            answer ^= columns[i]
+        vector >>= 1
+        i += 1
+    return answer
+
+def _matrix_multiply(a:list[int],b:list[int]) -> list[int]:
+    """
+    GF(2)-matrix product a @ b, both as list of columns
+    """
+    return [_matrix_apply(a,column) for column in b]
+
+@lru_cache(maxsize=None)
+def _zeros_power(width:int,poly:int,reflected:bool,power:int) -> tuple[int,...]:
+    """
+    Linear map (as columns) that pushes a register through 2 ** power zero-bytes
+    """
+    if power:
+        half = _zeros_power(width,poly,reflected,power - 1)
+        return tuple(_matrix_multiply(half,half))
+
+    table = _tables(width,poly,reflected,1)[0]
+    register_width = width if reflected else max(width,8)
+    mask = (1 << register_width) - 1
+
+    if reflected:
+        return tuple(table[(1 << i) & 0xff] ^ ((1 << i) >> 8) for i in range(register_width))
+    return tuple(table[(1 << i) >> (register_width - 8)] ^ (((1 << i) << 8) & mask) for i in range(register_width))
+
+@lru_cache(maxsize=256)
+def _zeros_operator(width:int,poly:int,reflected:bool,zero_bytes:int) -> tuple[int,...]:
+    """
+    Linear map (as columns) that pushes a register through zero_bytes zero-bytes.
+    Put together from the cached powers of two, so it's fast for any length.
+    """
+    answer = [1 << i for i in range(width if reflected else max(width,8))]
+    for power in range(zero_bytes.bit_length()):
+        if zero_bytes >> power & 1:
+            answer = _matrix_multiply(_zeros_power(width,poly,reflected,power),answer)
+    return tuple(answer)
+
+def _byte_tables(columns:tuple[int,...]) -> list[list[int]]:
+    """
+    Turns a GF(2)-matrix into one lookup table per input byte, so applying it takes one lookup per byte
+    """
+    tables = []
+    for start in range(0,len(columns),8):
+        byte_columns = columns[start:start + 8]
+        table = [0] * 256
+        for i in range(1,256):
+            low_bit = (i & -i).bit_length() - 1
+            table[i] = table[i & (i - 1)] ^ (byte_columns[low_bit] if low_bit < len(byte_columns) else 0)
+        tables.append(table)
+    return tables
+
+@lru_cache(maxsize=64)
+def _combine_tables(width:int,poly:int,reflected:bool,block_len:int,levels:int) -> list[list[np.ndarray]]:
+    """
+    Byte tables of the zero-byte shift for block_len, 2 * block_len, 4 * block_len, ... bytes
+    :param levels: How many doublings
+    :return: One list of byte tables per level
+    """
+    columns = _zeros_operator(width,poly,reflected,block_len)
+    answer = []
+    for _ in range(levels):
+        answer.append([np.array(i,dtype=np.uint64) for i in _byte_tables(columns)])
+        columns = tuple(_matrix_multiply(columns,columns))
+    return answer
+
+class CRC:
+    """
+    Cyclic redundancy check of any width from 3 to 64 bits.
+
+    Parameters follow the usual CRC catalogues (e.g. CRC_PRESETS).
+    Lookup tables are built on first use and shared between all CRC objects with the same width and poly.
+
+    Kernels:
+        bytewise:   One table lookup per byte
+        slice4/8:   Slicing-by-4/8, one lookup per byte but only one register-update per 4/8 bytes
+        numpy:      Splits the data into blocks that are processed simultaneously, then combines their registers
+        auto:       numpy for long inputs, slice8 otherwise
+    """
+
+    def __init__(
+            self,
+            width:int,
+            poly:int,
+            init:int = 0,
+            refin:bool = False,
+            refout:bool = False,
+            xorout:int = 0,
+            name:str = "",
+    ):
+        """
+        :param width: Register width in bits (3 - 64)
+        :param poly: Generator polynomial as bitmask, with or without the x^width term
+        :param init: Register value before the first byte (not reflected)
+        :param refin: True, if the bits of each input byte are processed LSB first
+        :param refout: True, if the register is reflected before xorout
+        :param xorout: XORed to the result
+        :param name: Only for printing
+        """
+        assert 3 <= width <= 64, "Only widths from 3 to 64 bits are supported"
+        mask = (1 << width) - 1
+        if poly >> width == 1: # Written with the x^width term
+            poly &= mask
+        assert 0 < poly <= mask and poly & 1, "poly must have grade width and end with +1"
+
+        self.width = width
+        self.poly = poly
+        self.init = init & mask
+        self.refin = refin
+        self.refout = refout
+        self.xorout = xorout & mask
+        self.name = name
+
+        self._register_width = width if refin else max(width,8)
+        self._mask = (1 << self._register_width) - 1
+
+    @classmethod
+    def from_name(cls,name:str) -> "CRC":
+        """
+        :param name: Key of CRC_PRESETS
+        :return:
+        """
+        return cls(name=name,**CRC_PRESETS[name])
+
+    def __repr__(self):
+        return (
+            f"CRC({self.name or '?'}: width={self.width}, poly={self.poly:#x}, init={self.init:#x}, "
+            f"refin={self.refin}, refout={self.refout}, xorout={self.xorout:#x})"
+        )
+
+    def _start_register(self) -> int:
+        if self.refin:
+            return reflect(self.init,self.width)
+        return self.init << (self._register_width - self.width)
+
+    def _finalize(self,register:int) -> int:
+        """
+        Turns a register into the CRC value
+        """
+        if not self.refin:
+            register >>= self._register_width - self.width
+        if self.refin != self.refout:
+            register = reflect(register,self.width)
+        return register ^ self.xorout
+
+    def _update(self,register:int,data:bytes|bytearray|memoryview,kernel:str = "auto") -> int:
+        """
+        Pushes data through the register
+        :return: New register
+        """
+        if kernel == "auto":
+            kernel = "numpy" if len(data) >= NUMPY_THRESHOLD else "slice8"
+
+        if kernel == "bytewise":
+            return self._update_bytewise(register,data)
+        if kernel == "slice4":
+            return self._update_sliced(register,data,4)
+        if kernel == "slice8":
+            return self._update_sliced(register,data,8)
+        if kernel == "numpy":
+            return self._update_numpy(register,data)
+        raise ValueError(f"Unknown kernel {kernel!r}, use one of {KERNELS} or 'auto'")
+
+    def compute(self,data:bytes|bytearray|memoryview|str,kernel:str = "auto") -> int:
+        """
+        CRC of data
+        :param data: Strings are encoded as utf-8
+        :param kernel: See class docstring
+        :return: CRC value
+        """
+        if isinstance(data,str):
+            data = data.encode()
+        return self._finalize(self._update(self._start_register(),data,kernel))
+
+    __call__ = compute
+
+    def new(self,data:bytes|bytearray|memoryview|str = b"") -> "CRCStream":
+        """
+        Incremental calculation, like hashlib: crc.new().update(a).update(b).digest() == crc(a + b)
+        :param data: First data
+        :return:
+        """
+        return CRCStream(self,data)
+
+    def _register_from_value(self,value:int) -> int:
+        """
+        Inverse of _finalize
+        """
+        register = value ^ self.xorout
+        if self.refin != self.refout:
+            register = reflect(register,self.width)
+        if not self.refin:
+            register <<= self._register_width - self.width
+        return register
+
+    def _shift_zeros(self,register:int,zero_bytes:int) -> int:
+        """
+        Pushes register through zero_bytes zero-bytes, by applying the cached powers of two
+        """
+        for power in range(zero_bytes.bit_length()):
+            if zero_bytes >> power & 1:
+                register = _matrix_apply(_zeros_power(self.width,self.poly,self.refin,power),register)
+        return register
+
+    def combine(self,crc1:int,crc2:int,len2:int) -> int:
+        """
+        CRC of the concatenation a + b, from only crc1 = CRC(a), crc2 = CRC(b) and len(b).
+        Costs O(log(len2)) small GF(2)-matrix operations, the data isn't needed.
+        :param crc1: CRC value of the first part
+        :param crc2: CRC value of the second part
+        :param len2: Length of the second part in bytes
+        :return: CRC value of both parts
+        """
+        # Since CRCs are linear: register(a + b) = shifted(register(a) XOR start) XOR register(b)
+        register = self._register_from_value(crc1) ^ self._start_register()
+        register = self._shift_zeros(register,len2) ^ self._register_from_value(crc2)
+        return self._finalize(register)
+
+    def compute_file(self,path:str,processes:int = None,chunk_size:int = 1 << 26) -> int:
+        """
+        CRC of a (large) file. It is memory-mapped and read in chunks, so it never has to fit into memory.
+        With processes > 1, the file is split into equal parts whose CRCs are calculated in a process pool
+        and put together with combine.
+        :param path:
+        :param processes: Number of worker processes, None for one per CPU core, 1 to stay in this process
+        :param chunk_size: Bytes per chunk
+        :return: CRC value
+        """
+        size = os.path.getsize(path)
+        if processes is None:
+            processes = os.cpu_count() or 1
+        processes = max(1,min(processes,size // chunk_size + 1))
+
+        if processes == 1:
+            return self._finalize(_file_part_register(self,path,0,size,chunk_size,self._start_register()))
+
+        part_len = -(-size // processes)
+        starts = list(range(0,size,part_len))
+        from concurrent.futures import ProcessPoolExecutor # Only imported when needed, it's slow to import
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            registers = pool.map(
+                _file_part_register,
+                [self] * len(starts),
+                [path] * len(starts),
+                starts,
+                [min(part_len,size - i) for i in starts],
+                [chunk_size] * len(starts),
+                [self._start_register()] + [0] * (len(starts) - 1),
+            )
+
+            register = 0
+            for start,part_register in zip(starts,registers):
+                register = self._shift_zeros(register,min(part_len,size - start)) ^ part_register
+
+        return self._finalize(register)
+
+    def _update_bytewise(self,register:int,data:bytes|bytearray|memoryview) -> int:
+        table = _tables(self.width,self.poly,self.refin,1)[0]
+
+        if self.refin:
+            for byte in bytes(data):
+                register = table[(register ^ byte) & 0xff] ^ (register >> 8)
+            return register
+
+        shift = self._register_width - 8
+        mask = self._mask
+        for byte in bytes(data):
+            register = table[((register >> shift) ^ byte) & 0xff] ^ ((register << 8) & mask)
+        return register
+
+    def _update_sliced(self,register:int,data:bytes|bytearray|memoryview,slices:int) -> int:
+        data = bytes(data)
+        full = len(data) - len(data) % slices
+        if not full:
+            return self._update_bytewise(register,data)
+
+        tables = _tables(self.width,self.poly,self.refin,slices)
+        words = np.frombuffer(data[:full],dtype=f"{'<' if self.refin else '>'}u{slices}").tolist()
+        register_width = self._register_width
+        mask = self._mask
+
+        # Reflected: Byte k of the word is followed by slices - 1 - k more bytes.
+        # Otherwise: Byte k (counted from the lowest) is followed by k more bytes.
+        if slices == 8:
+            t0, t1, t2, t3, t4, t5, t6, t7 = tables
+            if self.refin:
+                for word in words:
+                    word ^= register
+                    register = (
+                        t7[word & 0xff] ^ t6[(word >> 8) & 0xff] ^ t5[(word >> 16) & 0xff] ^ t4[(word >> 24) & 0xff] ^
+                        t3[(word >> 32) & 0xff] ^ t2[(word >> 40) & 0xff] ^ t1[(word >> 48) & 0xff] ^ t0[word >> 56]
+                    )
+            else:
+                align = 64 - register_width
+                for word in words:
+                    word ^= register << align
+                    register = (
+                        t0[word & 0xff] ^ t1[(word >> 8) & 0xff] ^ t2[(word >> 16) & 0xff] ^ t3[(word >> 24) & 0xff] ^
+                        t4[(word >> 32) & 0xff] ^ t5[(word >> 40) & 0xff] ^ t6[(word >> 48) & 0xff] ^ t7[word >> 56]
+                    )
+
+        elif slices == 4:
+            t0, t1, t2, t3 = tables
+            if self.refin:
+                for word in words:
+                    word ^= register
+                    register = (
+                        (word >> 32) ^
+                        t3[word & 0xff] ^ t2[(word >> 8) & 0xff] ^ t1[(word >> 16) & 0xff] ^ t0[(word >> 24) & 0xff]
+                    )
+            elif register_width >= 32:
+                align = register_width - 32
+                for word in words:
+                    word ^= register >> align
+                    register = (
+                        ((register << 32) & mask) ^
+                        t0[word & 0xff] ^ t1[(word >> 8) & 0xff] ^ t2[(word >> 16) & 0xff] ^ t3[word >> 24]
+                    )
+            else:
+                align = 32 - register_width
+                for word in words:
+                    word ^= register << align
+                    register = t0[word & 0xff] ^ t1[(word >> 8) & 0xff] ^ t2[(word >> 16) & 0xff] ^ t3[word >> 24]
+
+        else:
+            raise ValueError("Only slicing-by-4 and slicing-by-8 are supported")
+
+        return self._update_bytewise(register,data[full:])
+
+    def _update_numpy(self,register:int,data:bytes|bytearray|memoryview) -> int:
+        """
+        Every segment is cut into NUMPY_BLOCKS blocks, which are pushed through their own registers simultaneously
+        (slicing-by-8, the first block starts at the current register, the others at 0).
+        Since CRCs are linear, the registers are then combined pairwise:
+            (earlier block shifted by the length of the later one) XOR later block
+        """
+        data = np.frombuffer(data,dtype=np.uint8)
+        tables = _np_tables(self.width,self.poly,self.refin)
+        align = np.uint64(0 if self.refin else 64 - self._register_width)
+        shifts = [np.uint64(8 * k) for k in range(8)]
+        if self.refin:
+            tables = tables[::-1]
+
+        for start in range(0,len(data),NUMPY_SEGMENT):
+            segment = data[start:start + NUMPY_SEGMENT]
+            block_len = 8 * (len(segment) // (8 * NUMPY_BLOCKS))
+            if block_len < 64: # Not worth it
+                register = self._update_sliced(register,segment.tobytes(),8)
+                continue
+
+            words = (
+                segment[:block_len * NUMPY_BLOCKS]
+                .view("<u8" if self.refin else ">u8")
+                .reshape(NUMPY_BLOCKS,block_len // 8)
+                .T.astype(np.uint64,order="C")
+            )
+            registers = np.zeros(NUMPY_BLOCKS,dtype=np.uint64)
+            registers[0] = register
+
+            for word in words:
+                word ^= registers << align
+                registers = tables[0].take((word & 0xff).astype(np.intp))
+                for k in range(1,8):
+                    registers ^= tables[k].take(((word >> shifts[k]) & 0xff).astype(np.intp))
+
+            for shift_tables in _combine_tables(self.width,self.poly,self.refin,block_len,NUMPY_BLOCKS.bit_length() - 1):
+                earlier = registers[0::2]
+                registers = registers[1::2].copy()
+                for k,table in enumerate(shift_tables):
+                    registers ^= table.take(((earlier >> shifts[k]) & 0xff).astype(np.intp))
+
+            register = int(registers[0])
+            register = self._update_sliced(register,segment[block_len * NUMPY_BLOCKS:].tobytes(),8)
+
+        return register
+
+def _file_part_register(crc:CRC,path:str,start:int,length:int,chunk_size:int,register:int) -> int:
+    """
+    Pushes length bytes of the file from start on through register (worker of CRC.compute_file)
+    """
+    if not length:
+        return register
+
+    with open(path,"rb") as file, mmap.mmap(file.fileno(),0,access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            for chunk_start in range(start,start + length,chunk_size):
+                register = crc._update(register,view[chunk_start:min(chunk_start + chunk_size,start + length)])
+        finally:
+            view.release()
+
+    return register
+
+class CRCStream:
+    """
+    CRC that is calculated piece by piece, e.g. while receiving or reading data.
+    Use CRC.new to create one.
+    """
+
+    def __init__(self,crc:CRC,data:bytes|bytearray|memoryview|str = b""):
+        self.crc = crc
+        self.length = 0 # Bytes so far
+        self._register = crc._start_register()
+        self.update(data)
+
+    def update(self,data:bytes|bytearray|memoryview|str) -> "CRCStream":
+        """
+        Adds data
+        :param data: Strings are encoded as utf-8
+        :return: self, so calls can be chained
+        """
+        if isinstance(data,str):
+            data = data.encode()
+        self._register = self.crc._update(self._register,data)
+        self.length += len(data)
+        return self
+
+    def update_file(self,path:str,chunk_size:int = 1 << 26) -> "CRCStream":
+        """
+        Adds the content of a file, memory-mapped and in chunks
+        :param path:
+        :param chunk_size: Bytes per chunk
+        :return: self
+        """
+        size = os.path.getsize(path)
+        self._register = _file_part_register(self.crc,path,0,size,chunk_size,self._register)
+        self.length += size
+        return self
+
+    def digest(self) -> int:
+        """
+        CRC value of everything so far. More data can still be added afterward.
+        :return:
+        """
+        return self.crc._finalize(self._register)
+
+    def hexdigest(self) -> str:
+        return f"{self.digest():0{(self.crc.width + 3) // 4}x}"
+
+    def copy(self) -> "CRCStream":
+        new = CRCStream(self.crc)
+        new.length = self.length
+        new._register = self._register
+        return new
@@ -1,21 +1,237 @@
+import math
 import numpy as np
-from scipy.special import binom
-from typing import Iterator
+from typing import Iterator, NamedTuple
 from itertools import count
+from functools import lru_cache
+from collections import OrderedDict
+import sqlite3
+import threading
+
+# get_table and the tails keep their results for scalar parameters (in memory, optionally also in a sqlite file)
+TABLE_CACHE_SIZE = 256
+TAIL_CACHE_SIZE = 4096
+
+_table_cache:OrderedDict[tuple[float,float,int],np.ndarray] = OrderedDict() # (errorRate, n, k_min) -> P(k), P(<=k), P(>k)
+_cache_lock = threading.RLock()
+_disk_cache:sqlite3.Connection|None = None
+
+_scipy_special = None
+
+def _special() -> "module|None":
+    """
+    scipy.special, imported on first use, because importing it takes longer than everything else together.
+    None if SciPy isn't installed, then slower pure Python versions are used.
+    """
+    global _scipy_special
+    if _scipy_special is None:
+        try:
+            import scipy.special as special
+        except ImportError:
+            special = False
+        _scipy_special = special
+    return _scipy_special or None
+
+def _lgamma(x:float) -> float:
+    return math.lgamma(x) if x > 0 else math.inf
+
+def _gammaln(x:np.ndarray) -> np.ndarray:
+    special = _special()
+    if special is None:
+        return np.vectorize(_lgamma,otypes=[float])(x)
+    return special.gammaln(x)
+
+def _xlogy(x:np.ndarray,y:np.ndarray) -> np.ndarray:
+    """
+    x * log(y), but 0 if x is 0
+    """
+    return np.where(x == 0,0.0,x * np.log(y))
+
+def _xlog1py(x:np.ndarray,y:np.ndarray) -> np.ndarray:
+    """
+    x * log(1 + y), but 0 if x is 0
+    """
+    return np.where(x == 0,0.0,x * np.log1p(y))
+
+def _log_pmf(errorRate:float,n:float,k:int) -> float:
+    """
+    log_probability_k_errors for scalars, only with the math module
+    """
+    if k < 0 or k > n:
+        return -math.inf
+    if min(k,n - k) <= 10000: # log(binom(n, k)) as sum, lgamma(n + 1) alone would lose the digits for huge n
+        j = int(min(k,n - k))
+        answer = math.fsum(math.log((n - i) / (j - i)) for i in range(j))
+    else:
+        answer = math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+    if k:
+        answer += k * math.log(errorRate) if errorRate > 0 else -math.inf
+    if n - k:
+        answer += (n - k) * math.log1p(-errorRate) if errorRate < 1 else -math.inf
+    return answer
+
+def _tail_sum(errorRate:float,n:float,k:int,upper:bool,log_P_k:float = None) -> float:
+    """
+    P(>k) (upper) or P(<=k) without SciPy: The pmf is summed from k away from the mode, where the terms only get smaller.
+    If k is on the other side of the mode, the opposite tail is summed instead and subtracted from 1.
+    :param log_P_k: log(P(k)), if it's already known. The sum continues from it, so it matches those P(k).
+    """
+    if errorRate <= 0:
+        return 0.0 if upper else 1.0
+    if errorRate >= 1:
+        return 1.0 if upper else 0.0
+
+    mode = math.floor((n + 1) * errorRate)
+    if upper and k + 1 <= mode:
+        return max(0.0,1 - _tail_sum(errorRate,n,k,False,log_P_k))
+    if not upper and k > mode:
+        return max(0.0,1 - _tail_sum(errorRate,n,k,True,log_P_k))
+
+    odds = math.log(errorRate) - math.log1p(-errorRate)
+    j = k
+    log_term = _log_pmf(errorRate,n,k) if log_P_k is None else log_P_k
+    if upper:
+        j += 1
+        log_term += math.log(n - k) - math.log(k + 1) + odds
+    total = 0.0
+    while True:
+        term = math.exp(log_term)
+        total += term
+        if term <= total * 1e-17:
+            break
+        if upper:
+            if j >= n:
+                break
+            log_term += math.log(n - j) - math.log(j + 1) + odds
+            j += 1
+        else:
+            if j <= 0:
+                break
+            log_term += math.log(j) - math.log(n - j + 1) - odds
+            j -= 1
+    return min(1.0,total)
+
+def _binomial_tail(errorRate:float|np.ndarray,n:float|np.ndarray,k:int|np.ndarray,upper:bool) -> float|np.ndarray:
+    """
+    P(>k) (upper) or P(<=k) with the regularized incomplete beta function, valid for 0 <= k < n
+    """
+    special = _special()
+    if special is None:
+        return np.vectorize(_tail_sum,otypes=[float])(errorRate,n,k,upper)
+    if upper:
+        return special.betainc(np.maximum(k + 1,1),np.maximum(n - k,1),errorRate)
+    return special.betainc(np.maximum(n - k,1),np.maximum(k + 1,1),1 - errorRate)
+
+def _pmf_tail(
+        errorRate:float|np.ndarray,
+        n:float|np.ndarray,
+        k:int|np.ndarray,
+        upper:bool,
+        log_P_k:float|np.ndarray,
+) -> float|np.ndarray:
+    """
+    P(>k) (upper) or P(<=k) as sum of the pmf (_tail_sum) for any k, continued from log(P(k))
+    """
+    def tail(errorRate:float,n:float,k:int,log_P_k:float) -> float:
+        if k < 0:
+            return float(upper)
+        if k >= n:
+            return float(not upper)
+        return _tail_sum(errorRate,n,k,upper,log_P_k)
+    return np.vectorize(tail,otypes=[float])(errorRate,n,k,log_P_k)[()]
+
+def _plain(x:any) -> any:
+    """
+    Views ndarray-subclasses (e.g. GFArray) as plain ndarrays, so their special arithmetic isn't used here
+    """
+    if isinstance(x,np.ndarray):
+        return x.view(np.ndarray)
+    return x
+
+def log_probability_k_errors(errorRate:float|np.ndarray,n:int|np.ndarray,k:int|np.ndarray) -> float|np.ndarray:
+    """
+    Natural log of probability_k_errors.
+    Calculated with lgamma and log1p, so it neither overflows nor loses precision for huge n or tiny errorRate.
+    :param errorRate: 0 - 1, single symbol error probability
+    :param n: Symbol count
+    :param k: Error count
+    :return: log(P(k)), -inf if impossible
+    """
+    errorRate, n, k = _plain(errorRate), _plain(n), _plain(k)
+    if np.ndim(errorRate) == np.ndim(n) == np.ndim(k) == 0:
+        return np.float64(_log_pmf(float(errorRate),float(n),int(k)))
+
+    with np.errstate(divide="ignore",invalid="ignore"):
+        answer = (
+            _gammaln(n + 1) - _gammaln(k + 1) - _gammaln(n - k + 1)
+            + _xlogy(k,errorRate) + _xlog1py(n - k,-errorRate)
+        )
+    return np.where((k < 0) | (k > n),-np.inf,answer)[()]
 
 def probability_k_errors(errorRate:float|np.ndarray,n:int|np.ndarray,k:int|np.ndarray) -> float|np.ndarray:
     """
     Returns the probability of exactly k errors happening in n symbols.
-    You can replace ONE parameter by a np.ndarray.
+    Every parameter can be a np.ndarray, they are broadcast against each other.
     :param errorRate: 0 - 1, single symbol error probability
     :param n: Symbol count
     :param k: Error count
     :return: 0 - 1
     """
-    try:
-        return binom(n,k) * (errorRate ** k) * ((1 - errorRate) ** (n - k))
-    except OverflowError:
-        return errorRate * 0 + n * 0 + k * 0 # When you pass arrays, this will be converted to array
+    return np.exp(log_probability_k_errors(errorRate,n,k))
+
+def probability_more_than(errorRate:float|np.ndarray,n:int|np.ndarray,k:int|np.ndarray) -> float|np.ndarray:
+    """
+    Probability of more than k errors in n symbols.
+    Uses the regularized incomplete beta function, not 1 - P(<=k), so it stays exact for tiny tails.
+    :param errorRate: 0 - 1, single symbol error probability
+    :param n: Symbol count
+    :param k: Error count
+    :return: P(>k)
+    """
+    errorRate, n, k = _plain(errorRate), _plain(n), _plain(k)
+    if np.ndim(errorRate) == np.ndim(n) == np.ndim(k) == 0:
+        return _more_than_cached(float(errorRate),float(n),int(k))
+    return _more_than(errorRate,n,k)
+
+def _more_than(errorRate:float|np.ndarray,n:int|np.ndarray,k:int|np.ndarray) -> float|np.ndarray:
+    with np.errstate(invalid="ignore"):
+        answer = _binomial_tail(errorRate,n,k,True)
+    return np.where(k < 0,1.0,np.where(k >= n,0.0,answer))[()]
+
+def probability_up_to(errorRate:float|np.ndarray,n:int|np.ndarray,k:int|np.ndarray) -> float|np.ndarray:
+    """
+    Probability of up to k errors in n symbols. Counterpart of probability_more_than.
+    :param errorRate: 0 - 1, single symbol error probability
+    :param n: Symbol count
+    :param k: Error count
+    :return: P(<=k)
+    """
+    errorRate, n, k = _plain(errorRate), _plain(n), _plain(k)
+    if np.ndim(errorRate) == np.ndim(n) == np.ndim(k) == 0:
+        return _up_to_cached(float(errorRate),float(n),int(k))
+    return _up_to(errorRate,n,k)
+
+def _up_to(errorRate:float|np.ndarray,n:int|np.ndarray,k:int|np.ndarray) -> float|np.ndarray:
+    with np.errstate(invalid="ignore"):
+        answer = _binomial_tail(errorRate,n,k,False)
+    return np.where(k < 0,0.0,np.where(k >= n,1.0,answer))[()]
+
+_more_than_cached = lru_cache(maxsize=TAIL_CACHE_SIZE)(_more_than)
+_up_to_cached = lru_cache(maxsize=TAIL_CACHE_SIZE)(_up_to)
+
+def _point_mass(errorRate:float|np.ndarray,n:int|np.ndarray) -> tuple[np.ndarray,np.ndarray]:
+    """
+    For errorRate 0 or 1, all errors (none or all n) are certain. The log-ratio recurrence can't handle that,
+    for errorRate 1 it would add inf to the -inf of log(P(0)).
+    :return: Where errorRate is 0 or 1, the k with probability 1 there
+    """
+    return (errorRate <= 0) | (errorRate >= 1), np.where(errorRate >= 1,n,0)
+
+def _log_ratios(errorRate:float|np.ndarray,n:int|np.ndarray,k:np.ndarray) -> np.ndarray:
+    """
+    log(P(k + 1) / P(k)) == log((n - k) / (k + 1) * p / (1 - p))
+    """
+    with np.errstate(divide="ignore",invalid="ignore"):
+        return np.log(np.maximum(n - k,0)) - np.log(k + 1) + np.log(errorRate) - np.log1p(-errorRate)
 
 def probability_k_range(
         errorRate:float|np.ndarray,
@@ -26,6 +242,7 @@ def probability_k_range(
 ) -> Iterator[float|np.ndarray|tuple[int|float]|tuple[int|np.ndarray]]:
     """
     Returns values of probability_k_errors while increasing k from 0 to k_max.
+    Only the first value is calculated directly, every next one comes from the ratio P(k + 1) / P(k).
     :param returnKAsTuple: True, if k should also be returned
     :param k_min: First k to be returned
     :param k_max: Last k to be returned. -1 will make it run forever.
@@ -33,8 +250,13 @@ def probability_k_range(
     :param n: Symbol count
     :return: (k, probability) or (probability) depending on returnKAsTuple
     """
+    errorRate, n = _plain(errorRate), _plain(n)
+    degenerate, point = _point_mass(errorRate,n)
+    log_P = log_probability_k_errors(errorRate,n,k_min)
     for k in count(k_min):
-        _ = probability_k_errors(errorRate,n,k)
+        _ = np.exp(log_P)
+        if np.any(degenerate):
+            _ = np.where(degenerate,k == point,_)[()]
         if returnKAsTuple:
             yield k,_
         else:
@@ -42,6 +264,165 @@ def probability_k_range(
 
         if k == k_max:
             return
+        with np.errstate(invalid="ignore"):
+            log_P = log_P + _log_ratios(errorRate,n,k)
+
+def _table_columns(
+        errorRate:float|np.ndarray,
+        n:int|np.ndarray,
+        k_min:int,
+        k_max:int,
+        below:float|np.ndarray = None,
+) -> tuple[np.ndarray,np.ndarray,np.ndarray]:
+    """
+    Uncached values of get_table: P(k), P(<=k) and P(>k), one row per k.
+    Both tails are running sums of the same P(k), continued by the pmf summed outside of the table,
+    and the bigger tail of a row is 1 - the smaller one. So the columns agree with each other,
+    an independent formula (like the incomplete beta function) is off by about 1e-8 relative for n near 1e9.
+    :param below: P(<k_min), if it's already known (from the rows before)
+    """
+    k = np.arange(k_min,k_max + 1)
+    k = k.reshape(-1,*[1] * np.ndim(errorRate + n)) # One row per k, the array parameter along the other axis
+
+    log_ratios = _log_ratios(errorRate,n,k[:-1])
+    with np.errstate(invalid="ignore"):
+        log_P = log_probability_k_errors(errorRate,n,k_min) + np.concatenate([
+            np.zeros((1,*log_ratios.shape[1:])),
+            np.cumsum(log_ratios,axis=0),
+        ])
+    P = np.exp(log_P)
+
+    with np.errstate(invalid="ignore"):
+        if below is None:
+            below = _pmf_tail(errorRate,n,k_min - 1,False,log_P[0] - _log_ratios(errorRate,n,k[0] - 1))
+        above = _pmf_tail(errorRate,n,k_max,True,log_P[-1])
+        # All P(k) share the rounding error of log(P(k_min)) (lgamma of huge n), the sum of everything corrects it
+        total = below + P.sum(axis=0) + above
+        total = np.where(total > 0,total,1)
+        P, below, above = P / total, below / total, above / total
+
+    up_to = below + np.cumsum(P,axis=0)
+    more_than = np.empty_like(P)
+    more_than[-1] = 0
+    np.cumsum(P[:0:-1],axis=0,out=more_than[-2::-1])
+    more_than += above
+
+    lower = up_to <= more_than # Only the smaller tail is summed, the other is its complement
+    up_to, more_than = np.where(lower,up_to,1 - more_than), np.where(lower,1 - up_to,more_than)
+    up_to, more_than = np.clip(up_to,0,1), np.clip(more_than,0,1)
+
+    degenerate, point = _point_mass(errorRate,n)
+    if np.any(degenerate):
+        P = np.where(degenerate,k == point,P)
+        up_to = np.where(degenerate,k >= point,up_to)
+        more_than = np.where(degenerate,k < point,more_than)
+    return P, up_to, more_than
+
+def _cached_table_columns(errorRate:float,n:int,k_min:int,k_max:int) -> np.ndarray:
+    """
+    _table_columns for scalar parameters, from the caches if possible.
+    A cached table that is too short is extended by the missing rows only.
+    :return: (3, k_max - k_min + 1)-array of P(k), P(<=k) and P(>k)
+    """
+    key = (float(errorRate),float(n),int(k_min))
+    with _cache_lock:
+        columns = _table_cache.get(key)
+        if columns is not None:
+            _table_cache.move_to_end(key)
+
+    if columns is None:
+        columns = np.zeros((3,0))
+    needed = max(0,k_max - k_min + 1) # An empty table for k_max < k_min, not a slice from the end of the cached one
+
+    if columns.shape[1] < needed:
+        columns = np.concatenate([columns,_disk_load(key,k_min + columns.shape[1],k_max)],axis=1)
+
+    if columns.shape[1] < needed:
+        below = columns[1,-1] if columns.shape[1] else None # Continues the sums of the cached rows
+        new_columns = np.array(_table_columns(key[0],key[1],k_min + columns.shape[1],k_max,below),dtype=np.float64)
+        _disk_store(key,k_min + columns.shape[1],new_columns)
+        columns = np.concatenate([columns,new_columns],axis=1)
+
+    with _cache_lock:
+        if _table_cache.get(key) is None or _table_cache[key].shape[1] < columns.shape[1]:
+            _table_cache[key] = columns
+        _table_cache.move_to_end(key)
+        while len(_table_cache) > TABLE_CACHE_SIZE:
+            _table_cache.popitem(last=False)
+
+    return columns[:,:needed]
+
+def _disk_load(key:tuple[float,float,int],k_start:int,k_max:int) -> np.ndarray:
+    """
+    Rows k_start, k_start + 1, ... from the disk cache, as long as they are there without a gap (none without disk cache)
+    """
+    errorRate, n, k_min = key
+    with _cache_lock: # Checked under the lock, another thread could disable the disk cache in between
+        if _disk_cache is None:
+            return np.zeros((3,0))
+        rows = _disk_cache.execute(
+            "SELECT k, P, up_to, more_than FROM rows "
+            "WHERE errorRate = ? AND n = ? AND k_min = ? AND k BETWEEN ? AND ? ORDER BY k",
+            (errorRate,n,k_min,k_start,k_max),
+        ).fetchall()
+
+    found = 0
+    while found < len(rows) and rows[found][0] == k_start + found:
+        found += 1
+    return np.array([row[1:] for row in rows[:found]],dtype=np.float64).reshape(-1,3).T
+
+def _disk_store(key:tuple[float,float,int],k_start:int,columns:np.ndarray):
+    """
+    Adds rows to the disk cache, if there is one
+    """
+    errorRate, n, k_min = key
+    with _cache_lock:
+        if _disk_cache is None:
+            return
+        _disk_cache.executemany(
+            "INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(errorRate,n,k_min,k_start + i,*row) for i,row in enumerate(columns.T.tolist())],
+        )
+        _disk_cache.commit()
+
+def enable_disk_cache(path:str):
+    """
+    Also keeps the values of get_table in a sqlite file, so other sessions and batch jobs can reuse them.
+    :param path: Database file, created if it doesn't exist
+    :return:
+    """
+    global _disk_cache
+    disable_disk_cache()
+    connection = sqlite3.connect(path,check_same_thread=False)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS rows ("
+        "errorRate REAL, n REAL, k_min INTEGER, k INTEGER, P REAL, up_to REAL, more_than REAL, "
+        "PRIMARY KEY (errorRate, n, k_min, k))"
+    )
+    connection.commit()
+    with _cache_lock:
+        _disk_cache = connection
+
+def disable_disk_cache():
+    """
+    Closes the sqlite file of enable_disk_cache (if there is one)
+    :return:
+    """
+    global _disk_cache
+    with _cache_lock:
+        if _disk_cache is not None:
+            _disk_cache.close()
+        _disk_cache = None
+
+def clear_cache():
+    """
+    Empties the in-memory caches. The disk cache is kept.
+    :return:
+    """
+    with _cache_lock:
+        _table_cache.clear()
+    _more_than_cached.cache_clear()
+    _up_to_cached.cache_clear()
 
 def get_table(
         errorRate: float | np.ndarray,
@@ -61,6 +442,13 @@ def get_table(
         P(>k):      Probability of more than k errors
         1 // P(>k): Rough estimate of how frequently an n-sized block of symbols will have more than k errors. 'How many transmissions until the next error?'
 
+    P(<=k) and P(>k) are the true tails, also with k_min > 0. Before, P(<=k) was only the sum of the rows from k_min on
+    (and P(>k) 1 - that), so they ignored the probability of fewer than k_min errors.
+
+    P(k) is calculated for all k at once in the log domain (ratio recurrence).
+    P(<=k) and P(>k) are sums of these P(k), the smaller tail of each row is summed from its far end,
+    so it stays exact even below 1e-300, and the other one is 1 - it. So all columns agree for n up to 1e9.
+
     :param to_array: True, if return should be converted to np.array
     :param rounding: How many decimal points to be rounded to
     :param errorRate: Single Symbol error probability
@@ -69,31 +457,138 @@ def get_table(
     :param k_max: last k to be considered
     :return: (Detailed description in docstring)
     """
+    errorRate, n = _plain(errorRate), _plain(n)
+    is_array = isinstance(errorRate,np.ndarray) or isinstance(n,np.ndarray)
 
-    cum_sum = 0
-    table = list()
-    for k, P in probability_k_range(errorRate, n, k_min, k_max, returnKAsTuple=True):
-        cum_sum += P
+    if is_array:
+        P, up_to, more_than = _table_columns(errorRate,n,k_min,k_max)
+    else:
+        P, up_to, more_than = _cached_table_columns(errorRate,n,k_min,k_max)
 
-        if isinstance(P,np.ndarray):
-            k = np.full_like(P,k)
-            cum_sum = np.clip(cum_sum,0,1)
-        else:
-            cum_sum = min(1,cum_sum)
-        try:
-            table.append([
-                k,
-                np.round(P, rounding),
-                np.round(cum_sum, rounding),
-                np.round(1 - cum_sum, rounding),
-                np.round(1 / (1 - cum_sum))
-            ])
-        except ZeroDivisionError:
-            continue
+    with np.errstate(divide="ignore",over="ignore"):
+        frequency = np.round(1 / more_than)
+    k = np.arange(k_min,k_max + 1)
+    if not is_array: # Like before, rows with an infinite 1 / P(>k) are left out
+        finite = ~np.isinf(frequency)
+        k, P, up_to, more_than, frequency = k[finite], P[finite], up_to[finite], more_than[finite], frequency[finite]
 
+    columns = [np.round(P,rounding),np.round(up_to,rounding),np.round(more_than,rounding),frequency]
     if to_array:
-        return np.array(table)
-    return table
+        k = np.broadcast_to(k.reshape(-1,*[1] * (P.ndim - 1)),P.shape)
+        return np.stack([k,*columns],axis=1)
+
+    if is_array:
+        return [[np.full_like(P[i],k_i),*row] for i,(k_i,*row) in enumerate(zip(k,*columns))]
+    return [[k_i,*row] for k_i,*row in zip(k.tolist(),*columns)]
+
+SWEEP_FIELDS = ("P_eq","P_le","P_gt","period")
+
+def sweep_chunks(
+        errorRate:float|np.ndarray,
+        n:int|np.ndarray,
+        k:int|np.ndarray,
+        chunk_size:int = 1 << 22,
+        dtype:type = np.float64,
+) -> Iterator[tuple[np.ndarray,np.ndarray,np.ndarray]]:
+    """
+    Like sweep, but yields the result piece by piece, so even huge grids never have to be in memory at once.
+    :param errorRate: Single symbol error probabilities
+    :param n: Symbol counts
+    :param k: Error counts
+    :param chunk_size: Roughly how many values are calculated at once
+    :param dtype: Float type of the results
+    :return: (errorRate, n, chunk) with one (errorRate, n)-pair per row of the structured array chunk
+    """
+    errorRate = np.atleast_1d(_plain(errorRate)).astype(np.float64)
+    n = np.atleast_1d(_plain(n)).astype(np.float64)
+    k = np.atleast_1d(_plain(k)).astype(np.int64)
+    assert errorRate.ndim == n.ndim == k.ndim == 1, "Only 1-dimensional axes are supported"
+
+    # P(k) is needed for every k between the smallest and the biggest one, for the recurrence and the tail sums
+    k_low, k_high = int(k.min()), int(k.max())
+    span = np.arange(k_low,k_high + 1)
+    columns = k - k_low
+    if np.array_equal(columns,np.arange(len(span))):
+        columns = slice(None) # Much faster than indexing
+
+    # log(P(k) / P(k_low)) == sum of log((n - k) / (k + 1)) + (k - k_low) * log(p / (1 - p)),
+    # the first part only depends on n, so it is shared by all error rates
+    with np.errstate(divide="ignore",invalid="ignore"):
+        n_part = np.log(np.maximum(n[:,None] - span[:-1],0)) - np.log(span[:-1] + 1)
+        n_part = np.concatenate([np.zeros((len(n),1)),np.cumsum(n_part,axis=1)],axis=1)
+        p_part = np.log(errorRate) - np.log1p(-errorRate)
+    steps = np.arange(len(span))
+
+    n_rows = max(1,min(len(n),chunk_size // len(span)))
+    p_rows = max(1,chunk_size // (len(span) * n_rows))
+    dtype = np.dtype([(name,dtype) for name in SWEEP_FIELDS])
+
+    for p_start in range(0,len(errorRate),p_rows):
+        for n_start in range(0,len(n),n_rows):
+            p = errorRate[p_start:p_start + p_rows,None,None]
+            m = n[None,n_start:n_start + n_rows,None]
+            shape = (p.shape[0] * m.shape[1],len(span))
+
+            with np.errstate(invalid="ignore"):
+                p_steps = p_part[p_start:p_start + p_rows,None] * steps
+                p_steps[:,0] = 0 # Avoids -inf * 0 for errorRate 0
+                log_P = n_part[None,n_start:n_start + n_rows] + p_steps[:,None,:]
+                log_P += log_probability_k_errors(p,m,k_low)
+            P = np.exp(log_P,out=log_P).reshape(shape)
+            p, m = np.broadcast_arrays(p,m)
+            p, m = p.reshape(-1,1), m.reshape(-1,1)
+
+            degenerate, point = _point_mass(p,m)
+            if degenerate.any():
+                P = np.where(degenerate,span == point,P)
+
+            # Both sums start at the end where they are small, anchored with the exact incomplete beta value
+            up_to = np.cumsum(P,axis=1)
+            up_to += probability_up_to(p,m,k_low - 1)
+            more_than = np.empty_like(P)
+            more_than[:,-1] = 0
+            np.cumsum(P[:,:0:-1],axis=1,out=more_than[:,-2::-1])
+            more_than += probability_more_than(p,m,k_high)
+
+            chunk = np.empty((len(p),len(k)),dtype=dtype)
+            chunk["P_eq"] = P[:,columns]
+            np.minimum(up_to[:,columns],1,out=chunk["P_le"])
+            np.minimum(more_than[:,columns],1,out=chunk["P_gt"])
+            with np.errstate(divide="ignore",over="ignore"):
+                np.divide(1,chunk["P_gt"],out=chunk["period"])
+            yield p[:,0], m[:,0], chunk
+
+def sweep(
+        errorRate:float|np.ndarray,
+        n:int|np.ndarray,
+        k:int|np.ndarray,
+        chunk_size:int = 1 << 22,
+        dtype:type = np.float64,
+) -> np.ndarray:
+    """
+    Every combination of errorRate, n and k at once, e.g. for capacity planning.
+
+    The result is a structured array of shape (len(errorRate), len(n), len(k)) with the fields
+        P_eq:   Probability of exactly k errors
+        P_le:   Probability of up to k errors
+        P_gt:   Probability of more than k errors
+        period: 1 / P(>k), like the last column of get_table
+
+    :param errorRate: Single symbol error probabilities
+    :param n: Symbol counts
+    :param k: Error counts
+    :param chunk_size: Roughly how many values are calculated at once, limits the memory for intermediate results
+    :param dtype: Float type of the results, e.g. np.float32 to halve the memory
+    :return: (Detailed description in docstring)
+    """
+    shape = (np.size(errorRate),np.size(n),np.size(k))
+    answer = np.empty((shape[0] * shape[1],shape[2]),dtype=[(name,dtype) for name in SWEEP_FIELDS])
+
+    start = 0
+    for _,_,chunk in sweep_chunks(errorRate,n,k,chunk_size,dtype):
+        answer[start:start + len(chunk)] = chunk
+        start += len(chunk)
+    return answer.reshape(shape)
 
 def ber_from_ser(ser:float|np.ndarray,bit_per_symbol:int = 8) -> float|np.ndarray:
     """
@@ -116,6 +611,20 @@ def ser_from_ber(ber:float|np.ndarray,bit_per_symbol:int = 8) -> float|np.ndarra
     assert bit_per_symbol, "bit_per_symbol can't be 0"
     return 1 - (1 - ber) ** bit_per_symbol
 
+def symbol_error_rate(sent:np.ndarray,received:np.ndarray) -> float:
+    """
+    Measures the symbol-error-rate (SER) by comparing sent and received symbols, e.g. two GFArrays.
+    The result can be used as errorRate for the other functions.
+    :param sent: Symbols that were sent
+    :param received: Symbols that were received, same shape as sent
+    :return: Fraction of differing symbols
+    """
+    sent, received = _plain(np.asarray(sent)), _plain(np.asarray(received))
+    assert sent.shape == received.shape, "sent and received need the same shape"
+    if not sent.size:
+        return 0
+    return np.count_nonzero(sent != received) / sent.size
+
 @np.vectorize
 def round_to_exponential(x:float,digits:int = 2) -> float:
     """
@@ -130,6 +639,123 @@ def round_to_exponential(x:float,digits:int = 2) -> float:
     exp = int(np.log10(x))
     return np.round(x,-exp + 1 + digits)
 
+class CodeCandidate(NamedTuple):
+    """
+    One result of optimize_code
+    """
+    family: str     # "RS" or "BCH"
+    m: int          # Bits per symbol of the field (codewords of BCH have 2^m - 1 bits)
+    n: int          # Symbols per codeword
+    k: int          # Message symbols per codeword
+    t: int          # Correctable symbol errors
+    rate: float     # k / n
+    failure: float  # P(>t), probability that a codeword can't be corrected
+
+    @property
+    def overhead(self) -> float:
+        return (self.n - self.k) / self.k
+
+@lru_cache(maxsize=1024)
+def _rs_candidates(m:int,ber:float,target_failure:float,max_overhead:float) -> tuple[CodeCandidate,...]:
+    """
+    For every t, the longest (possibly shortened) RS code over GF(2^m) that still meets target_failure.
+    P(>t) grows with n and shrinks with t, so the full length only has to be checked for each t,
+    and the shortened lengths are found by bisection (for all t at once).
+    """
+    ser = ser_from_ber(ber,m)
+    n_full = (1 << m) - 1
+    t = np.arange(1,int(max_overhead * n_full / (2 * (1 + max_overhead))) + 1)
+    if not len(t):
+        return tuple()
+
+    n = np.full(len(t),n_full)
+    failure = probability_more_than(ser,n_full,t)
+
+    # Shortest allowed length (overhead budget), then bisect between that and the full length
+    short = failure > target_failure
+    low = np.ceil(2 * t[short] * (1 + 1 / max_overhead)).astype(np.int64)
+    high = np.full(len(low),n_full)
+    feasible = probability_more_than(ser,low,t[short]) <= target_failure
+    while np.any(high - low > 1):
+        middle = (low + high) // 2
+        ok = probability_more_than(ser,middle,t[short]) <= target_failure
+        low, high = np.where(ok,middle,low), np.where(ok,high,middle)
+    n[short] = np.where(feasible,low,0)
+
+    keep = n > 0
+    t, n = t[keep], n[keep]
+    failure = probability_more_than(ser,n,t)
+    return tuple(
+        CodeCandidate("RS",m,n_i,n_i - 2 * t_i,t_i,(n_i - 2 * t_i) / n_i,f)
+        for n_i,t_i,f in zip(n.tolist(),t.tolist(),failure.tolist())
+    )
+
+@lru_cache(maxsize=1024)
+def _bch_candidates(m:int,ber:float,target_failure:float,max_overhead:float) -> tuple[CodeCandidate,...]:
+    """
+    All primitive BCH codes of length 2^m - 1 within the overhead budget that meet target_failure
+    """
+    import BCH # Only needed here, and BCH itself uses this module
+
+    n = (1 << m) - 1
+    t, k = list(), list()
+    for t_i in range(1,n // 2 + 1):
+        k_i = n - BCH.bch_parity_count(m,t_i)
+        if (n - k_i) / k_i > max_overhead:
+            break
+        if k and k[-1] == k_i: # Same code, it simply corrects more than designed
+            t[-1] = t_i
+        else:
+            t.append(t_i)
+            k.append(k_i)
+
+    failure = probability_more_than(ber,n,np.array(t,dtype=np.int64)).tolist()
+    return tuple(
+        CodeCandidate("BCH",m,n,k_i,t_i,k_i / n,f)
+        for k_i,t_i,f in zip(k,t,failure)
+        if f <= target_failure
+    )
 
+def optimize_code(
+        target_failure:float,
+        ber:float = None,
+        ser:float = None,
+        bit_per_symbol:int = 8,
+        max_overhead:float = 1,
+        families:tuple[str,...] = ("RS","BCH"),
+        m_range:range = range(3,17),
+) -> list[CodeCandidate]:
+    """
+    Finds the codes worth implementing for a channel: Every returned code fails at most with target_failure per codeword,
+    and none of them is beaten by another one in both rate and reliability (Pareto front).
+    The first one has the highest rate, so it is the cheapest code that meets the target.
+
+    Candidates are RS codes over GF(2^m) (also shortened) and primitive binary BCH codes of length 2^m - 1.
+    Results are cached, so asking again for the same channel is instant.
+
+    :param target_failure: Highest acceptable probability P(>t) for a codeword
+    :param ber: Bit error rate of the channel
+    :param ser: Instead of ber, the symbol error rate of the channel
+    :param bit_per_symbol: Bits per symbol of ser
+    :param max_overhead: Highest acceptable (n - k) / k
+    :param families: Which codes to consider
+    :param m_range: Which field sizes to consider
+    :return: Pareto front, highest rate first
+    """
+    assert (ber is None) != (ser is None), "Pass either ber or ser"
+    assert 0 < target_failure < 1, "target_failure has to be between 0 and 1"
+    if ber is None:
+        ber = float(ber_from_ser(ser,bit_per_symbol))
 
+    candidates = list()
+    for m in m_range:
+        if "RS" in families:
+            candidates.extend(_rs_candidates(m,ber,target_failure,max_overhead))
+        if "BCH" in families:
+            candidates.extend(_bch_candidates(m,ber,target_failure,max_overhead))
 
+    front = list()
+    for candidate in sorted(candidates,key=lambda c:(-c.rate,c.failure)):
+        if not front or candidate.failure < front[-1].failure:
+            front.append(candidate)
+    return front
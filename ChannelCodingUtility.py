@@ -1,10 +1,174 @@
 
 # Use this file as a base if you want to compile the Python program to executable
+#
+# Without arguments, the GUI is started.
+# With arguments, tables are calculated headless (FreeSimpleGUI is never imported), e.g.
+#   python ChannelCodingUtility.py params.csv --format jsonl > tables.jsonl
+#   python ChannelCodingUtility.py - < params.csv
+# Parameter rows are CSV with a header (errorRate,n,k_max and optionally k_min) or JSON Lines with the same keys.
 
-try:
-    import main
-    main.main()
-except:
-    pass
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from collections import deque
+from typing import Iterable, Iterator, TextIO
+
+import Calculations as calc
+
+CSV_COLUMNS = ["errorRate","n","k","P_eq","P_le","P_gt","period"]
+
+def _parse_json(line:str) -> dict|str:
+    """
+    :return: Parameters or the error message, so one broken line doesn't stop the others
+    """
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as ex:
+        return f"{type(ex).__name__}: {ex}"
+
+def read_parameters(file:TextIO) -> Iterator[tuple[int,dict|str]]:
+    """
+    Reads parameter rows lazily, so the input can be a never-ending pipe
+    :param file: CSV with header or JSON Lines
+    :return: (line number, parameters or error message if the line can't be read)
+    """
+    lines = (line for line in enumerate(file,1) if line[1].strip())
+    first = next(lines,None)
+    if first is None:
+        return
+
+    if first[1].lstrip().startswith("{"):
+        yield first[0], _parse_json(first[1])
+        for number,line in lines:
+            yield number, _parse_json(line)
+        return
+
+    header = next(csv.reader([first[1]]))
+    for number,line in lines:
+        yield number, dict(zip(header,next(csv.reader([line]))))
+
+def calculate(number:int,parameters:dict|str,rounding:int) -> tuple[int,dict|str,list[list]|str]:
+    """
+    One table. Runs in the worker processes.
+    :param number: Line number of the parameters, for error messages
+    :param parameters: errorRate, n, k_max and optionally k_min, or the error message of read_parameters
+    :param rounding: Passed to get_table
+    :return: number, parameters, table rows or an error message
+    """
+    if isinstance(parameters,str):
+        return number, parameters, parameters
+
+    try:
+        table = calc.get_table(
+            float(parameters["errorRate"]),
+            int(parameters["n"]),
+            int(parameters["k_max"]),
+            k_min=int(parameters.get("k_min") or 0),
+            rounding=rounding,
+        )
+    except Exception as ex: # Any, or .result() would raise it and end the whole batch
+        return number, parameters, f"{type(ex).__name__}: {ex}"
+    return number, parameters, [[int(row[0])] + [float(i) for i in row[1:]] for row in table]
+
+def _json_value(value:any) -> any:
+    """
+    NaN and infinity as null, json.dumps would write them as NaN/Infinity, which isn't valid JSON
+    """
+    if isinstance(value,float) and not math.isfinite(value):
+        return None
+    return value
+
+def pool_map(function:callable,arguments:Iterable[tuple],processes:int) -> Iterator:
+    """
+    Like ProcessPoolExecutor.map, but only keeps a few jobs in flight, so results stream out while the input is read
+    :param function:
+    :param arguments:
+    :param processes: 1 to stay in this process
+    :return: Results in the order of arguments
+    """
+    if processes == 1:
+        for args in arguments:
+            yield function(*args)
+        return
 
+    from concurrent.futures import ProcessPoolExecutor # Only imported when needed, it's slow to import
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = deque()
+        for args in arguments:
+            pending.append(pool.submit(function,*args))
+            if len(pending) >= 4 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
+def run_batch(source:TextIO,target:TextIO,output_format:str = "csv",processes:int = None,rounding:int = 100) -> int:
+    """
+    Calculates a table for every parameter row and writes it as soon as it's done
+    :param source: Parameter rows
+    :param target: Where the tables go
+    :param output_format: "csv" (one line per table row) or "jsonl" (one line per table)
+    :param processes: Number of worker processes, None for one per CPU core
+    :param rounding: Passed to get_table
+    :return: Number of parameter rows that failed
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    writer = None
+    if output_format == "csv":
+        writer = csv.writer(target)
+        writer.writerow(CSV_COLUMNS)
+
+    failed = 0
+    arguments = ((number,parameters,rounding) for number,parameters in read_parameters(source))
+    for number,parameters,table in pool_map(calculate,arguments,processes):
+        if isinstance(table,str):
+            print(f"Line {number}: {table}",file=sys.stderr)
+            failed += 1
+            continue
+
+        if writer is None:
+            row = {key:_json_value(value) for key,value in parameters.items()}
+            row["table"] = [[_json_value(value) for value in table_row] for table_row in table]
+            try:
+                target.write(json.dumps(row,allow_nan=False) + "\n")
+            except ValueError as ex: # Still NaN somewhere deeper in the parameters
+                print(f"Line {number}: {type(ex).__name__}: {ex}",file=sys.stderr)
+                failed += 1
+                continue
+        else:
+            writer.writerows([parameters["errorRate"],parameters["n"],*row] for row in table)
+        target.flush()
+
+    return failed
+
+def main_cli(argv:list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Calculates error tables without the GUI")
+    parser.add_argument("input",nargs="?",default="-",help="Parameter file (CSV or JSON Lines), - for stdin")
+    parser.add_argument("-o","--output",default="-",help="Output file, - for stdout")
+    parser.add_argument("-f","--format",choices=["csv","jsonl"],default="csv")
+    parser.add_argument("-p","--processes",type=int,default=None,help="Worker processes, default one per CPU core")
+    parser.add_argument("-r","--rounding",type=int,default=100,help="Decimal points to round to")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input,newline="")
+    target = sys.stdout if args.output == "-" else open(args.output,"w",newline="")
+    try:
+        failed = run_batch(source,target,args.format,args.processes,args.rounding)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1: # Only explicitly, stdin isn't a terminal in IDE consoles and launchers either
+        sys.exit(main_cli(sys.argv[1:]))
+
+    import main
+    main.main()
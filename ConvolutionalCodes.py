@@ -0,0 +1,302 @@
+import numpy as np
+
+# Puncturing patterns for the common (171, 133) code with constraint length 7 (as used by DVB, 802.11 and CCSDS).
+# Rows are the generator outputs (X for 171, Y for 133), columns the time steps of one period, 0 means the bit isn't sent.
+PUNCTURE_PATTERNS = {
+    "1/2": ((1,),(1,)),
+    "2/3": ((1,0),(1,1)),
+    "3/4": ((1,0,1),(1,1,0)),
+    "5/6": ((1,0,1,0,1),(1,1,0,1,0)),
+    "7/8": ((1,0,0,0,1,0,1),(1,1,1,1,0,1,0)),
+}
+
+def _output_table(generators:tuple[int,...],constraint_length:int) -> np.ndarray:
+    """
+    Output bits for every content of the shift register.
+    Bit constraint_length - 1 of the register (the MSB, like in the octal notation of the generators) is the newest input.
+    :return: (2^constraint_length, len(generators))-array of 0/1
+    """
+    return np.array([
+        [bin(register & g).count("1") & 1 for g in generators]
+        for register in range(1 << constraint_length)
+    ],dtype=np.uint8)
+
+def _puncture_mask(puncture:tuple[tuple[int,...],...]|None,outputs:int) -> np.ndarray:
+    """
+    :return: Flat 0/1 mask of one period, in the order the bits are sent (per time step all outputs)
+    """
+    if puncture is None:
+        return np.ones(outputs,dtype=bool)
+
+    mask = np.array(puncture,dtype=bool)
+    assert mask.ndim == 2 and len(mask) == outputs, "The puncturing pattern needs one row per generator"
+    assert mask.any(axis=0).all(), "Every column of the puncturing pattern has to keep at least one bit"
+    return mask.T.ravel()
+
+class ConvEncoder:
+    """
+    Feedforward convolutional encoder (rate 1/len(generators) before puncturing) for whole batches of bit-frames.
+    The generators are given like in the literature, e.g. (0o171, 0o133) with constraint length 7:
+    The MSB taps the newest input bit.
+
+    All register contents of all frames are built at once with K shifted ORs, then the output bits are looked up.
+    """
+
+    def __init__(self,generators:tuple[int,...] = (0o171,0o133),constraint_length:int = 7,puncture:tuple[tuple[int,...],...]|str = None):
+        """
+        :param generators: One generator polynomial per output bit
+        :param constraint_length: K, number of input bits that influence an output bit (memory + 1)
+        :param puncture: Pattern (one row per generator, 0 drops that bit) or a key of PUNCTURE_PATTERNS
+        """
+        assert 2 <= constraint_length <= 16, "constraint_length has to be between 2 and 16"
+        assert generators and all(0 < g < 1 << constraint_length for g in generators), \
+            f"Generators have to be between 1 and 2^{constraint_length} - 1"
+
+        if isinstance(puncture,str):
+            puncture = PUNCTURE_PATTERNS[puncture]
+
+        self.generators = tuple(generators)
+        self.constraint_length = constraint_length
+        self.puncture = puncture
+
+        self._table = _output_table(self.generators,constraint_length)
+        self._mask = _puncture_mask(puncture,len(self.generators))
+
+    @property
+    def rate(self) -> float:
+        """
+        Input bits per sent bit (without the termination tail)
+        """
+        return len(self._mask) / len(self.generators) / self._mask.sum()
+
+    def encode(self,bits:np.ndarray,terminate:bool = True) -> np.ndarray:
+        """
+        Encodes a batch of frames
+        :param bits: (N, L)-array of 0/1, or a single frame of length L
+        :param terminate: Appends constraint_length - 1 zeros, so every frame ends in state 0
+        :return: (N, sent bits)-array of 0/1 (uint8), 1-dimensional if a single frame was passed
+        """
+        bits = np.asarray(bits,dtype=np.uint8) & 1
+        single = bits.ndim == 1
+        if single:
+            bits = bits[None,:]
+
+        memory = self.constraint_length - 1
+        padded = np.zeros((len(bits),memory + bits.shape[1] + memory * terminate),dtype=np.int32)
+        padded[:,memory:memory + bits.shape[1]] = bits
+        steps = padded.shape[1] - memory
+
+        registers = np.zeros((len(bits),steps),dtype=np.int32)
+        for i in range(self.constraint_length): # Input from i steps ago sits at bit K - 1 - i
+            registers |= padded[:,memory - i:memory - i + steps] << (memory - i)
+
+        sent = self._table[registers].reshape(len(bits),-1)
+        if self.puncture is not None:
+            sent = sent[:,np.resize(self._mask,sent.shape[1])]
+        return sent[0] if single else sent
+
+class ViterbiDecoder:
+    """
+    Viterbi decoder for whole batches of frames (matching ConvEncoder with the same parameters).
+
+    Add-compare-select is done for all states of all frames at once:
+    State s (the last K - 1 inputs, newest as MSB) is reached from 2 * (s mod 2^(K-2)) and that + 1,
+    so both candidates are just the even and odd metrics, no gathering needed.
+    The decisions are stored as bits in a ring buffer of traceback + chunk steps, so memory doesn't grow with the frame length.
+    Every chunk steps, the best path is traced back and the oldest chunk bits (older than traceback) are output.
+
+    Metrics are correlations with the received values (hard decision: 0 -> +1, 1 -> -1), punctured bits count as 0.
+    Throughput grows with the number of frames, so decode cuts a single frame into a batch of segments (decode_stream).
+    """
+
+    def __init__(
+            self,
+            generators:tuple[int,...] = (0o171,0o133),
+            constraint_length:int = 7,
+            puncture:tuple[tuple[int,...],...]|str = None,
+            traceback:int = None,
+    ):
+        """
+        :param generators: Same as for the encoder
+        :param constraint_length: Same as for the encoder
+        :param puncture: Same as for the encoder
+        :param traceback: Decision depth, None for 5 * constraint_length (twice that with puncturing)
+        """
+        encoder = ConvEncoder(generators,constraint_length,puncture)
+        if traceback is None:
+            traceback = 5 * constraint_length * (1 if puncture is None else 2)
+
+        self.generators = encoder.generators
+        self.constraint_length = constraint_length
+        self.puncture = encoder.puncture
+        self.traceback = traceback
+        self.rate = encoder.rate
+        self._mask = encoder._mask
+
+        outputs = len(self.generators)
+        states = 1 << (constraint_length - 1)
+        half = states // 2
+
+        # Output pattern (as number) of the transition from predecessor 2j + b into state u * half + j
+        patterns = encoder._table @ (1 << np.arange(outputs - 1,-1,-1))
+        next_states = np.arange(states)
+        inputs = next_states >> (constraint_length - 2)
+        predecessors = 2 * (next_states % half)
+        self._branch0 = patterns[(inputs << (constraint_length - 1)) | predecessors]
+        self._branch1 = patterns[(inputs << (constraint_length - 1)) | predecessors | 1]
+
+        # Signs of every output pattern, correlating with them gives the branch metrics
+        pattern_bits = (np.arange(1 << outputs)[:,None] >> np.arange(outputs - 1,-1,-1)) & 1
+        self._signs = (1 - 2 * pattern_bits).astype(np.float32).T # (outputs, patterns)
+
+    def _depuncture(self,received:np.ndarray) -> np.ndarray:
+        """
+        :param received: (N, sent bits) values, +-1 like
+        :return: (N, steps, outputs) values, 0 at the punctured bits
+        """
+        outputs = len(self.generators)
+        kept = np.cumsum(self._mask)
+        periods, rest = divmod(received.shape[1],int(kept[-1]))
+        if rest:
+            ends = np.flatnonzero((kept == rest) & (np.arange(len(self._mask)) % outputs == outputs - 1))
+            assert len(ends), "The number of received bits doesn't fit the puncturing pattern"
+            length = periods * len(self._mask) + ends[0] + 1
+        else:
+            length = periods * len(self._mask)
+
+        full = np.zeros((len(received),length),dtype=np.float32)
+        full[:,np.resize(self._mask,length)] = received
+        return full.reshape(len(received),-1,outputs)
+
+    def _values(self,received:np.ndarray,soft:bool) -> np.ndarray:
+        received = np.asarray(received)
+        if soft:
+            return received.astype(np.float32)
+        return 1 - 2 * (received & 1).astype(np.float32)
+
+    def _viterbi(self,values:np.ndarray,start_zero:np.ndarray,end_zero:np.ndarray,chunk:int = None) -> np.ndarray:
+        """
+        :param values: (N, steps, outputs)
+        :param start_zero: (N,) True for frames that start in state 0, otherwise every state is possible
+        :param end_zero: (N,) True for frames that end in state 0 (terminated), otherwise the best state is used
+        :param chunk: Steps between tracebacks, None for the traceback depth
+        :return: (N, steps) input bits
+        """
+        frames, steps, _ = values.shape
+        states = len(self._branch0)
+        half = states // 2
+        memory = self.constraint_length - 1
+        depth = self.traceback
+        chunk = chunk or depth
+        window = depth + chunk
+
+        # State-major, so the even/odd predecessor metrics are contiguous rows of all frames
+        metrics = np.zeros((states,frames),dtype=np.float32)
+        metrics[1:,start_zero] = -np.inf
+        candidate0 = np.empty((2,half,frames),dtype=np.float32)
+        candidate1 = np.empty_like(candidate0)
+        decisions = np.empty((states,frames),dtype=bool)
+        history = np.zeros((window,states,(frames + 7) // 8),dtype=np.uint8) # Decision bits, packed along the frames
+        decoded = np.zeros((frames,steps),dtype=np.uint8)
+        frame_bytes = np.arange(frames) >> 3
+        frame_bits = np.arange(frames) & 7
+
+        def trace(state:np.ndarray,last:int,first:int,output:bool) -> np.ndarray:
+            """
+            Follows the decisions from step last back to step first
+            :param output: True to store the bits of these steps
+            :return: States before step first
+            """
+            for step in range(last,first - 1,-1):
+                if output:
+                    decoded[:,step] = state >> (memory - 1)
+                chosen = (history[step % window][state,frame_bytes] >> frame_bits) & 1
+                state = ((state << 1) & (states - 1)) | chosen
+            return state
+
+        output_done = 0 # Bits of all steps before are decoded
+        for start in range(0,steps,chunk):
+            stop = min(start + chunk,steps)
+            pattern_metrics = self._signs.T @ values[:,start:stop].transpose(1,2,0) # (chunk, patterns, N)
+            branch0 = pattern_metrics[:,self._branch0].reshape(-1,2,half,frames)
+            branch1 = pattern_metrics[:,self._branch1].reshape(-1,2,half,frames)
+
+            for step in range(start,stop):
+                np.add(branch0[step - start],metrics[0::2],out=candidate0)
+                np.add(branch1[step - start],metrics[1::2],out=candidate1)
+                np.greater(candidate1,candidate0,out=decisions.reshape(2,half,frames))
+                np.maximum(candidate0,candidate1,out=metrics.reshape(2,half,frames))
+                history[step % window] = np.packbits(decisions,axis=1,bitorder="little")
+
+            metrics -= metrics.max(axis=0) # Keeps the metrics small, float32 would lose precision otherwise
+
+            if stop < steps and stop - depth > output_done: # Steps older than the traceback depth are decided
+                state = trace(np.argmax(metrics,axis=0),stop - 1,stop - depth,False)
+                trace(state,stop - depth - 1,output_done,True)
+                output_done = stop - depth
+
+        state = np.argmax(metrics,axis=0)
+        state[end_zero] = 0
+        trace(state,steps - 1,output_done,True)
+        return decoded
+
+    def decode(self,received:np.ndarray,soft:bool = False,terminated:bool = True) -> np.ndarray:
+        """
+        Decodes a batch of frames of the same length. A single frame is decoded with decode_stream.
+        :param received: (N, sent bits)-array, or a single frame.
+            Hard decision: bits 0/1. Soft decision: positive values for 0, negative for 1
+            (e.g. BPSK symbols 0 -> +1, 1 -> -1 with noise, or LLRs log(P(0) / P(1)))
+        :param soft: True for soft decision
+        :param terminated: True, if the encoder terminated the frames (the tail bits are removed)
+        :return: (N, L)-array of bits (uint8), 1-dimensional if a single frame was passed
+        """
+        values = self._values(received,soft)
+        if values.ndim == 1:
+            # Alone, every trellis step would only handle one frame. As batch of overlapping segments, it's vectorized
+            return self.decode_stream(values,True,terminated)
+
+        values = self._depuncture(values)
+        frames = len(values)
+        decoded = self._viterbi(values,np.ones(frames,dtype=bool),np.full(frames,terminated))
+        if terminated:
+            decoded = decoded[:,:decoded.shape[1] - (self.constraint_length - 1)]
+        return decoded
+
+    def decode_stream(self,received:np.ndarray,soft:bool = False,terminated:bool = True,segment:int = None) -> np.ndarray:
+        """
+        Decodes one long frame by cutting it into overlapping segments, which are decoded as one batch.
+        Every segment is extended by the traceback depth on both sides, so the overlaps decide its start and end state
+        (only the first one starts in state 0 and only the last one can end in state 0).
+        :param received: Sent bits of one frame, see decode
+        :param soft: True for soft decision
+        :param terminated: True, if the encoder terminated the frame
+        :param segment: Steps (input bits) per segment, None to choose by the length
+            (short segments mean more frames per trellis step, but every one adds 2 * traceback steps of overlap)
+        :return: Bits
+        """
+        values = self._depuncture(self._values(received,soft)[None,:])[0]
+        steps = len(values)
+        margin = self.traceback
+        if segment is None:
+            segment = int(np.clip(steps // 64,margin,8 * margin))
+        length = segment + 2 * margin
+
+        if steps <= length:
+            decoded = self._viterbi(values[None],np.array([True]),np.array([terminated]))[0]
+        else:
+            starts = np.arange(0,steps,segment) # Output part of every segment
+            window_starts = np.clip(starts - margin,0,steps - length)
+            windows = values[window_starts[:,None] + np.arange(length)]
+            decoded_windows = self._viterbi(
+                windows,
+                window_starts == 0,
+                (window_starts + length == steps) & terminated,
+            )
+            decoded = np.zeros(steps,dtype=np.uint8)
+            for start,window_start,bits in zip(starts,window_starts,decoded_windows):
+                stop = min(start + segment,steps)
+                decoded[start:stop] = bits[start - window_start:stop - window_start]
+
+        if terminated:
+            decoded = decoded[:steps - (self.constraint_length - 1)]
+        return decoded
@@ -1,7 +1,424 @@
-from functools import wraps
+from functools import wraps, lru_cache
+from numbers import Integral
 
-class GFn: # Only for typehints
-    pass
+import numpy as np
+
+# Default primitive polynomials (including the x^m term) for GF(2^m)
+PRIMITIVE_POLYNOMIALS = {
+    1: 0b11,
+    2: 0b111,
+    3: 0b1011,
+    4: 0b10011,
+    5: 0b100101,
+    6: 0b1000011,
+    7: 0b10001001,
+    8: 0b100011101,
+    9: 0b1000010001,
+    10: 0b10000001001,
+    11: 0b100000000101,
+    12: 0b1000001010011,
+    13: 0b10000000011011,
+    14: 0b100010001000011,
+    15: 0b1000000000000011,
+    16: 0b10001000000001011,
+}
+
+class GFn(int):
+    """
+    Base class of all GF(2^m) element types.
+    Don't instantiate directly, get a field type from make_GF instead.
+
+    Every field value exists exactly once (elements are cached), so creating elements is just a lookup.
+    Addition is XOR, multiplication/division/powers are done with exp/log tables.
+    Plain ints are reduced mod 2^m before being used as an element.
+    """
+    __slots__ = ()
+
+    m:int = 0
+    order:int = 1 # Number of elements in the field
+    primitive_poly:int = 0
+
+    _exp:list[int] = [] # alpha ** i, twice as long as needed, so sums of two logs don't need a modulo
+    _log:list[int] = [] # log_alpha(i), _log[0] is meaningless
+    _elements:tuple = ()
+
+    def __new__(cls,value:int=0):
+        if type(value) is cls:
+            return value
+        return cls._elements[int(value) % cls.order]
+
+    def __reduce__(self):
+        return _unpickle_element, (self.m, self.primitive_poly, int(self))
+
+    def _coerce(self,other):
+        """
+        Returns other as an element of this field or None if that's not possible
+        """
+        if type(other) is type(self):
+            return other
+        if isinstance(other,int):
+            return self._elements[other % self.order]
+        if isinstance(other,Integral): # numpy integers
+            return self._elements[int(other) % self.order]
+        return None
+
+    def __add__(self, other):
+        if (other := self._coerce(other)) is None:
+            return NotImplemented
+        return self._elements[int.__xor__(self,other)]
+
+    __radd__ = __add__
+    __sub__ = __add__ # -a == a in GF(2^m)
+    __rsub__ = __add__
+
+    def __mul__(self, other):
+        if (other := self._coerce(other)) is None:
+            return NotImplemented
+        if not self or not other:
+            return self._elements[0]
+        return self._elements[self._exp[self._log[self] + self._log[other]]]
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if (other := self._coerce(other)) is None:
+            return NotImplemented
+        if not other:
+            raise ZeroDivisionError(f"Division by 0 in {type(self).__name__}")
+        if not self:
+            return self
+        return self._elements[self._exp[self._log[self] - self._log[other] + self.order - 1]]
+
+    def __rtruediv__(self, other):
+        if (other := self._coerce(other)) is None:
+            return NotImplemented
+        return other / self
+
+    __floordiv__ = __truediv__ # Division in a field has no remainder
+    __rfloordiv__ = __rtruediv__
+
+    def __mod__(self, other):
+        if (other := self._coerce(other)) is None:
+            return NotImplemented
+        if not other:
+            raise ZeroDivisionError(f"Division by 0 in {type(self).__name__}")
+        return self._elements[0]
+
+    def __divmod__(self, other):
+        return self / other, self % other
+
+    def __pow__(self, power:int, modulo=None):
+        if not self:
+            if power < 0:
+                raise ZeroDivisionError(f"0 can't be raised to a negative power in {type(self).__name__}")
+            return self._elements[1] if power == 0 else self
+        return self._elements[self._exp[(self._log[self] * int(power)) % (self.order - 1)]]
+
+    def __neg__(self):
+        return self
+
+    def __pos__(self):
+        return self
+
+    def inverse(self):
+        """
+        Multiplicative inverse, so self * self.inverse() == 1
+        :return:
+        """
+        if not self:
+            raise ZeroDivisionError(f"0 has no inverse in {type(self).__name__}")
+        return self._elements[self._exp[self.order - 1 - self._log[self]]]
+
+    def log(self) -> int:
+        """
+        Discrete logarithm to the base of the primitive element alpha
+        :return: i, so that alpha ** i == self
+        """
+        if not self:
+            raise ValueError(f"0 has no logarithm in {type(self).__name__}")
+        return self._log[self]
+
+    @classmethod
+    def alpha(cls):
+        """
+        Primitive element of the field (the root of primitive_poly)
+        :return:
+        """
+        return cls._elements[cls._exp[1 % (cls.order - 1)]]
+
+def make_GF(m:int,primitive_poly:int=None) -> type:
+    """
+    Creates the element type of GF(2^m), built from primitive_poly.
+    Calling it again with the same arguments returns the same type.
+
+    :param m: Bits per symbol
+    :param primitive_poly: Primitive polynomial as bitmask including the x^m term, e.g. 0b100011101 for GF(2^8).
+        Taken from PRIMITIVE_POLYNOMIALS if not given.
+    :return: Subclass of GFn
+    """
+    assert 1 <= m <= 16, "Only GF(2^1) up to GF(2^16) is supported"
+    if primitive_poly is None:
+        primitive_poly = PRIMITIVE_POLYNOMIALS[m]
+    assert primitive_poly >> m == 1, "primitive_poly must have grade m"
+
+    return _make_GF(m,primitive_poly)
+
+@lru_cache(maxsize=None)
+def _make_GF(m:int,primitive_poly:int) -> type:
+    """
+    Cached part of make_GF, so GF8 == make_GF(8) == make_GF(8,0b100011101)
+    """
+    order = 1 << m
+    exp = [0] * (2 * (order - 1))
+    log = [0] * order
+
+    x = 1
+    for i in range(order - 1):
+        if i and x == 1:
+            raise ValueError(f"{bin(primitive_poly)} is not primitive")
+        exp[i] = x
+        log[x] = i
+
+        x <<= 1
+        if x & order:
+            x ^= primitive_poly
+
+    exp[order - 1:] = exp[:order - 1]
+
+    the_class = type(f"GF{m}",(GFn,),{
+        "__slots__": (),
+        "__module__": __name__,
+        "m": m,
+        "order": order,
+        "primitive_poly": primitive_poly,
+        "_exp": exp,
+        "_log": log,
+    })
+    the_class._elements = tuple(int.__new__(the_class,i) for i in range(order))
+
+    return the_class
+
+@lru_cache(maxsize=None)
+def _np_tables(field:type) -> tuple[np.ndarray,np.ndarray,np.ndarray|None]:
+    """
+    NumPy versions of the field tables, built on first use
+    :param field: Subclass of GFn
+    :return: exp, log, flat multiplication table (only for fields up to 2^8 elements, else None)
+    """
+    dtype = _storage_dtype(field)
+    exp = np.array(field._exp,dtype=dtype)
+    log = np.array(field._log,dtype=np.intp)
+
+    mul = None
+    if field.order <= 256:
+        mul = exp[log[:,None] + log[None,:]]
+        mul[0,:] = 0
+        mul[:,0] = 0
+        mul = mul.ravel()
+
+    return exp, log, mul
+
+def _storage_dtype(field:type) -> type:
+    return np.uint8 if field.m <= 8 else np.uint16
+
+class GFArray(np.ndarray):
+    """
+    NumPy-array of GF(2^m) elements, stored as uint8 (m <= 8) or uint16.
+    Arithmetic (+ - * / ** and @) is done in the field for the whole array at once, broadcasting works like in NumPy.
+
+    Plain ints and GFn elements are accepted as operands.
+    Indexing a single value returns a GFn element.
+    """
+
+    def __new__(cls,values,field:type=None):
+        """
+        :param values: Anything np.asarray accepts with an integer (or bool) dtype. Ints are reduced mod 2^m.
+        :param field: Subclass of GFn. Taken from values if that's a GFArray, GF8 otherwise.
+        """
+        if field is None:
+            field = getattr(values,"field",GF8)
+
+        dtype = _storage_dtype(field)
+        arr = np.asarray(values)
+        if arr.dtype.kind not in "uib" and arr.size: # Like operands, floats aren't silently truncated
+            raise TypeError(f"Can't use {arr.dtype} values in {field.__name__}")
+        if arr.dtype != dtype or (field.m != 8 and field.m != 16):
+            arr = np.asarray((arr.astype(np.int64) % field.order).astype(dtype))
+
+        obj = arr.view(cls)
+        obj.field = field
+        return obj
+
+    def __array_finalize__(self, obj):
+        self.field = getattr(obj,"field",GF8)
+
+    def __reduce__(self):
+        pickled = super().__reduce__()
+        return pickled[0], pickled[1], (pickled[2], self.field.m, self.field.primitive_poly)
+
+    def __setstate__(self, state):
+        state, m, primitive_poly = state
+        super().__setstate__(state)
+        self.field = make_GF(m,primitive_poly)
+
+    def __getitem__(self, item):
+        answer = super().__getitem__(item)
+        if isinstance(answer,np.ndarray):
+            return answer
+        return self.field(int(answer))
+
+    def elements(self) -> list:
+        """
+        Returns the (flattened) values as GFn elements, e.g. to create a Polynomial
+        :return:
+        """
+        return list(map(self.field,self.ravel().tolist()))
+
+    def inverse(self) -> "GFArray":
+        """
+        Element-wise multiplicative inverse
+        :return:
+        """
+        return _wrap(_inverse(self.view(np.ndarray),self.field),self.field)
+
+    def log(self) -> np.ndarray:
+        """
+        Element-wise discrete logarithm to the base alpha
+        :return: int-array
+        """
+        plain = self.view(np.ndarray)
+        if not plain.all():
+            raise ValueError(f"0 has no logarithm in {self.field.__name__}")
+        return _np_tables(self.field)[1][plain]
+
+    def __pow__(self, power):
+        return np.power(self,power) # ndarray.__pow__ would turn ** 2 into np.square etc.
+
+    def __ipow__(self, power):
+        return np.power(self,power,out=(self,))
+
+    def __array_ufunc__(self, ufunc, method, *inputs, out=None, **kwargs):
+        field = self.field
+        for i in inputs + (out or ()):
+            if isinstance(i,GFArray) and i.field is not field:
+                raise TypeError(f"Can't mix {field.__name__} and {i.field.__name__}")
+
+        if ufunc is np.power: # Exponent is a normal integer, not a field element
+            plain = [_to_plain(inputs[0],field),np.asarray(inputs[1])]
+        else:
+            plain = [_to_plain(i,field) for i in inputs]
+
+        if ufunc in (np.add,np.subtract):
+            answer = getattr(np.bitwise_xor,method)(*plain,**kwargs)
+        elif ufunc in _FIELD_UFUNCS and (method != "__call__" or kwargs.get("where",True) is not True):
+            return NotImplemented # e.g. np.multiply.reduce, there is no field version of it
+        elif ufunc in (np.negative,np.positive):
+            answer = plain[0].copy()
+        elif ufunc is np.multiply:
+            answer = _multiply(*plain,field)
+        elif ufunc is np.square:
+            answer = _multiply(plain[0],plain[0],field)
+        elif ufunc in (np.true_divide,np.floor_divide):
+            answer = _multiply(plain[0],_inverse(plain[1],field),field)
+        elif ufunc is np.reciprocal:
+            answer = _inverse(plain[0],field)
+        elif ufunc is np.power:
+            answer = _power(*plain,field)
+        elif ufunc is np.matmul:
+            answer = _matmul(*plain,field)
+        else: # Comparisons and everything else are done on the plain values
+            if out: # In place, e.g. a ^= b, writes through into the GFArray
+                kwargs["out"] = tuple(o.view(np.ndarray) if isinstance(o,GFArray) else o for o in out)
+            answer = getattr(ufunc,method)(*plain,**kwargs)
+            if out:
+                return out[0] if len(out) == 1 else out
+            return answer
+
+        if out:
+            out[0].view(np.ndarray)[...] = answer
+            return out[0]
+        return _wrap(answer,field)
+
+# Ufuncs that GFArray calculates in the field, all others (comparisons, max, all, ...) work on the plain values
+_FIELD_UFUNCS = (
+    np.negative,np.positive,np.multiply,np.square,np.true_divide,np.floor_divide,np.reciprocal,np.power,np.matmul,
+)
+
+def _wrap(plain:np.ndarray,field:type) -> GFArray:
+    if not isinstance(plain,np.ndarray): # e.g. reductions to a single value
+        return field(int(plain))
+    arr = plain.astype(_storage_dtype(field),copy=False).view(GFArray)
+    arr.field = field
+    return arr
+
+def _to_plain(value,field:type) -> np.ndarray:
+    """
+    Converts operands of GFArray-operations to plain arrays of field values
+    """
+    if isinstance(value,GFArray):
+        return value.view(np.ndarray)
+    value = np.asarray(value)
+    if value.dtype.kind not in "uib":
+        raise TypeError(f"Can't use {value.dtype} values in {field.__name__}")
+    return np.asarray((value.astype(np.int64) % field.order).astype(_storage_dtype(field)))
+
+def _multiply(a:np.ndarray,b:np.ndarray,field:type) -> np.ndarray:
+    exp, log, mul = _np_tables(field)
+    if mul is not None:
+        return mul[(a.astype(np.intp) << field.m) | b]
+
+    return np.where((a == 0) | (b == 0),0,exp[log[a] + log[b]])
+
+def _inverse(a:np.ndarray,field:type) -> np.ndarray:
+    if not np.all(a):
+        raise ZeroDivisionError(f"0 has no inverse in {field.__name__}")
+    exp, log, _ = _np_tables(field)
+    return exp[field.order - 1 - log[a]]
+
+def _power(a:np.ndarray,power:np.ndarray,field:type) -> np.ndarray:
+    if power.dtype.kind not in "uib":
+        raise TypeError("Only integer powers are possible")
+    exp, log, _ = _np_tables(field)
+    power = power.astype(np.int64)
+
+    zero = a == 0
+    if np.any(zero & (power < 0)):
+        raise ZeroDivisionError(f"0 can't be raised to a negative power in {field.__name__}")
+
+    answer = exp[(log[a] * (power % (field.order - 1))) % (field.order - 1)]
+    return np.where(zero,(power == 0).astype(answer.dtype),answer)
+
+def _matmul(a:np.ndarray,b:np.ndarray,field:type,chunk_elements:int = 1 << 20) -> np.ndarray:
+    """
+    Matrix product in the field, same shape rules as np.matmul.
+    The inner dimension is processed in chunks, so at most ~chunk_elements products exist at once.
+    """
+    if a.ndim == 0 or b.ndim == 0:
+        raise ValueError("matmul: Input operand does not have enough dimensions")
+
+    a2 = a if a.ndim > 1 else a[None,:]
+    b2 = b if b.ndim > 1 else b[:,None]
+    inner = a2.shape[-1]
+    if inner != b2.shape[-2]:
+        raise ValueError(f"matmul: Mismatch in inner dimension ({inner} != {b2.shape[-2]})")
+
+    out_shape = np.broadcast_shapes(a2.shape[:-2],b2.shape[:-2]) + (a2.shape[-2],b2.shape[-1])
+    answer = np.zeros(out_shape,dtype=_storage_dtype(field))
+
+    per_k = max(1,int(np.prod(out_shape)))
+    step = max(1,chunk_elements // per_k)
+    for k in range(0,inner,step):
+        products = _multiply(a2[...,:,k:k + step,None],b2[...,None,k:k + step,:],field)
+        answer ^= np.bitwise_xor.reduce(products,axis=-2)
+
+    if a.ndim == 1:
+        answer = answer[...,0,:]
+    if b.ndim == 1:
+        answer = answer[...,0]
+    return answer
+
+def _unpickle_element(m:int,primitive_poly:int,value:int) -> GFn:
+    return make_GF(m,primitive_poly)(value)
 
 def mod_izer(mod_by:int,force_type:type=None) -> callable:
     """
@@ -25,6 +442,7 @@ def GF_class(mod_by,force_type:bool=None) -> callable:
     """
     Turns all arithmetic operations inside the class into mod_ized functions.
     Calculations should all be done only with other members of the same class.
+    This is ring arithmetic mod mod_by, for real GF(2^m) fields use make_GF.
 
     :param force_type: True, if the class shall be applied to every arithmetic return value
     :param mod_by:
@@ -82,30 +500,6 @@ def GF_class(mod_by,force_type:bool=None) -> callable:
 
     return make_GF_class_inner
 
-@GF_class(2,force_type=True)
-class GF1(int, GFn):
-    pass
-
-@GF_class(16,force_type=True)
-class GF4(int, GFn):
-    pass
-
-@GF_class(256,force_type=True)
-class GF8(int, GFn):
-    pass
-
-x = GF1(5)
-y = GF1(2)
-
-# print(x)
-
-# print(x * y)
-
-
-
-
-
-
-
-
-
+GF1 = make_GF(1)
+GF4 = make_GF(4)
+GF8 = make_GF(8)
@@ -0,0 +1,165 @@
+import sys
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Iterator
+
+import GaloisFields
+import Polynomials
+
+# Classes whose methods are counted, and modules whose functions are counted
+CLASSES:tuple[type,...] = (
+    Polynomials.Polynomial,
+    Polynomials.PreparedDivisor,
+    Polynomials.BinaryPolynomial,
+    GaloisFields.GFn,
+    GaloisFields.GFArray,
+)
+MODULES = (Polynomials,GaloisFields)
+
+_active = False
+
+class Report:
+    """
+    What happened while instrument() was active.
+    Times are wall times in seconds. total_time includes the methods called from inside, self_time doesn't.
+    """
+
+    def __init__(self):
+        self.calls:dict[str,int] = dict()
+        self.total_time:dict[str,float] = dict()
+        self.self_time:dict[str,float] = dict()
+        self.wall_time:float = 0.0
+        self._stack:list[float] = list() # Time spent in called (instrumented) functions, per running call
+
+    @property
+    def polynomials_created(self) -> int:
+        return self.calls.get("Polynomial.__init__",0) + self.calls.get("Polynomial._from_raw",0)
+
+    @property
+    def binary_polynomials_created(self) -> int:
+        return self.calls.get("BinaryPolynomial.__init__",0)
+
+    @property
+    def field_ops(self) -> int:
+        """
+        Calls of any method of the GF element types (arithmetic, inverse, creating elements, ...)
+        """
+        return sum(n for name,n in self.calls.items() if name.startswith("GFn."))
+
+    def top(self,count:int = 20,key:str = "self_time") -> list[tuple[str,int,float,float]]:
+        """
+        :param count:
+        :param key: "self_time", "total_time" or "calls"
+        :return: (name, calls, total_time, self_time), sorted by key
+        """
+        order = getattr(self,key)
+        names = sorted(self.calls,key=lambda name:order[name],reverse=True)[:count]
+        return [(name,self.calls[name],self.total_time[name],self.self_time[name]) for name in names]
+
+    def __str__(self):
+        lines = [
+            f"Wall time: {self.wall_time:.6f} s, "
+            f"Polynomials created: {self.polynomials_created}, field ops: {self.field_ops}",
+            f"{'':<40}{'calls':>12}{'total s':>12}{'self s':>12}",
+        ]
+        lines += [f"{name:<40}{calls:12}{total:12.6f}{own:12.6f}" for name,calls,total,own in self.top()]
+        return "\n".join(lines)
+
+def _counted(function:callable,name:str,report:Report) -> callable:
+    calls, total_time, self_time, stack = report.calls, report.total_time, report.self_time, report._stack
+
+    @wraps(function)
+    def counted(*args,**kwargs):
+        stack.append(0.0)
+        start = perf_counter()
+        try:
+            return function(*args,**kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            children = stack.pop()
+            calls[name] = calls.get(name,0) + 1
+            total_time[name] = total_time.get(name,0.0) + elapsed
+            self_time[name] = self_time.get(name,0.0) + elapsed - children
+            if stack:
+                stack[-1] += elapsed
+
+    return counted
+
+def _counted_attribute(attribute:any,name:str,report:Report) -> any:
+    """
+    Instrumented version of a class attribute, None if it's not something callable
+    """
+    if isinstance(attribute,(staticmethod,classmethod)):
+        return type(attribute)(_counted(attribute.__func__,name,report))
+    if isinstance(attribute,property):
+        return property(*[
+            None if f is None else _counted(f,f"{name}.{kind}",report)
+            for f,kind in ((attribute.fget,"get"),(attribute.fset,"set"),(attribute.fdel,"del"))
+        ],attribute.__doc__)
+    if callable(attribute) and not isinstance(attribute,type):
+        return _counted(attribute,name,report)
+    return None
+
+def _patch(report:Report,classes:tuple[type,...]) -> list[tuple[object,str,any]]:
+    """
+    Replaces all methods and functions by counting versions
+    :param report:
+    :param classes: Whose methods get counted
+    :return: (owner, attribute name, original), to undo it
+    """
+    patches = list()
+
+    for cls in classes:
+        for attribute_name,attribute in list(vars(cls).items()):
+            if attribute_name in ("__class__","__init_subclass__","__subclasshook__"):
+                continue
+            counted = _counted_attribute(attribute,f"{cls.__name__}.{attribute_name}",report)
+            if counted is not None:
+                patches.append((cls,attribute_name,attribute))
+                setattr(cls,attribute_name,counted)
+
+    # Module functions, also where they were imported into other modules (e.g. from Polynomials import ...)
+    originals = dict()
+    for module in MODULES:
+        for attribute_name,attribute in vars(module).items():
+            if callable(attribute) and not isinstance(attribute,type) and getattr(attribute,"__module__",None) == module.__name__:
+                originals[id(attribute)] = (attribute,_counted(attribute,f"{module.__name__}.{attribute_name}",report))
+
+    for module in list(sys.modules.values()):
+        for attribute_name,attribute in list(getattr(module,"__dict__",{}).items()):
+            if id(attribute) in originals and originals[id(attribute)][0] is attribute:
+                patches.append((module,attribute_name,attribute))
+                setattr(module,attribute_name,originals[id(attribute)][1])
+
+    return patches
+
+@contextmanager
+def instrument(extra_classes:tuple[type,...] = ()) -> Iterator[Report]:
+    """
+    Counts calls and time of every method of Polynomial, PreparedDivisor, BinaryPolynomial, the GF types and GFArray,
+    and of the module functions of Polynomials and GaloisFields:
+
+        with instrument() as report:
+            decoder.decode(received)
+        print(report)
+
+    Only while active, the methods are replaced by counting versions. Outside of it, nothing is changed, so it costs nothing.
+    Not thread-safe and can't be nested.
+    :param extra_classes: Other classes to count too, e.g. ring classes made with GF_class (their mod_izer-wrapped operators)
+    :return: Report, filled while running and complete after leaving
+    """
+    global _active
+    assert not _active, "instrument() can't be nested"
+    _active = True
+
+    report = Report()
+    patches = _patch(report,CLASSES + tuple(extra_classes))
+    start = perf_counter()
+    try:
+        yield report
+    finally:
+        report.wall_time = perf_counter() - start
+        for owner,attribute_name,original in reversed(patches):
+            setattr(owner,attribute_name,original)
+        _active = False
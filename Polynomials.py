@@ -1,67 +1,353 @@
+from array import array
 from collections.abc import Iterable
 from typing import Self
-from functools import total_ordering
+from functools import total_ordering, lru_cache
 
+import numpy as np
 
-from GaloisFields import GF1,GF4,GF8,GFn,GF_class
+from GaloisFields import GF1,GF4,GF8,GFn,GF_class,GFArray,_storage_dtype
 
 def map_list(to_type:type,the_list:list|Iterable):
     return type(the_list)(map(to_type,the_list))
 
+def _is_gf(val_type:type) -> bool:
+    """
+    True, if val_type is a GF(2^m) element type
+    """
+    return isinstance(val_type,type) and issubclass(val_type,GFn)
+
+def _typecode(val_type:type) -> str|None:
+    """
+    array-typecode GF(2^m) factors are packed into (same sizes as GFArray), None for other types (kept in a list)
+    """
+    if not _is_gf(val_type):
+        return None
+    return "B" if val_type.m <= 8 else "H"
+
+class _FactorList(list):
+    """
+    Polynomial.vals of packed GF(2^m) factors: A list of the elements, but changing it also changes the polynomial,
+    like when the factors were stored in a list (p.vals[0] = GF8(3) etc.)
+    """
+    _polynomial = None
+
+    @classmethod
+    def _of(cls,polynomial:"Polynomial") -> "_FactorList":
+        factors = cls(map(polynomial.val_type._elements.__getitem__,polynomial._vals))
+        factors._polynomial = polynomial
+        return factors
+
+    def __reduce__(self): # Copies are plain lists, not connected to the polynomial
+        return list, (list(self),)
+
+def _writes_through(name:str) -> callable:
+    method = getattr(list,name)
+
+    def changed(self:_FactorList,*args,**kwargs):
+        answer = method(self,*args,**kwargs)
+        polynomial = self._polynomial
+        if polynomial is not None and _is_gf(polynomial.val_type):
+            polynomial._vals = array(_typecode(polynomial.val_type),map(polynomial.val_type,self))
+            polynomial._find_grade()
+        return answer
+
+    changed.__name__ = name
+    return changed
+
+for _name in ("__setitem__","__delitem__","__iadd__","__imul__","append","extend","insert","pop","remove","reverse","sort","clear"):
+    setattr(_FactorList,_name,_writes_through(_name))
+
+# Shorter factor-lists are multiplied schoolbook-style, longer ones by the faster methods
+KARATSUBA_THRESHOLD = 32
+GF_VECTOR_THRESHOLD = 24
+FFT_THRESHOLD = 128
+HALF_GCD_THRESHOLD = 64 # Below this grade, half_gcd falls back to the plain Euclidean algorithm
+
+def _convolve(a:list|array,b:list|array,val_type:type) -> list|array:
+    """
+    Multiplication engine of Polynomial.
+    The method is picked by length and factor type:
+        GFn:    Schoolbook with exp/log tables, Karatsuba on GFArrays for long inputs
+        float:  Schoolbook, FFT for long inputs
+        others: Schoolbook, Karatsuba for long inputs
+    :param a: Factors, highest grade first (packed array for GFn)
+    :param b: Factors, highest grade first (packed array for GFn)
+    :param val_type: Type of the factors
+    :return: Factors of a * b, highest grade first (packed array for GFn)
+    """
+    shorter = min(len(a),len(b))
+
+    if _is_gf(val_type):
+        if shorter < GF_VECTOR_THRESHOLD:
+            return array(a.typecode,_gf_schoolbook(a,b,val_type))
+        dtype = _storage_dtype(val_type)
+        answer = _gf_karatsuba(
+            GFArray(np.frombuffer(a,dtype)[::-1],val_type),
+            GFArray(np.frombuffer(b,dtype)[::-1],val_type),
+        )
+        return array(a.typecode,np.ascontiguousarray(answer[::-1],dtype).tobytes())
+
+    if val_type is float and shorter >= FFT_THRESHOLD:
+        return _fft_convolve(a,b)
+
+    if shorter >= KARATSUBA_THRESHOLD:
+        return _karatsuba(a[::-1],b[::-1])[::-1]
+    return _schoolbook(a,b)
+
+def _schoolbook(a:list,b:list) -> list:
+    answer = [a[0] * 0] * (len(a) + len(b) - 1)
+    for i,v1 in enumerate(a):
+        if v1:
+            for j,v2 in enumerate(b):
+                answer[i + j] += v1 * v2
+    return answer
+
+def _gf_schoolbook(a:array,b:array,field:type) -> list[int]:
+    """
+    Schoolbook multiplication on the raw exp/log tables, no element objects in between
+    :return: Plain ints
+    """
+    exp, log = field._exp, field._log
+    answer = [0] * (len(a) + len(b) - 1)
+    b_logs = [(j,log[v]) for j,v in enumerate(b) if v]
+    for i,v1 in enumerate(a):
+        if v1:
+            l1 = log[v1]
+            for j,l2 in b_logs:
+                answer[i + j] ^= exp[l1 + l2]
+    return answer
+
+def _karatsuba(a:list,b:list) -> list:
+    """
+    Karatsuba multiplication for factor types without a faster special case
+    :param a: Factors, LOWEST grade first
+    :param b: Factors, LOWEST grade first
+    :return: Factors of a * b, lowest grade first
+    """
+    if min(len(a),len(b)) < KARATSUBA_THRESHOLD:
+        return _schoolbook(a,b)
+
+    if len(a) < len(b):
+        a, b = b, a
+    zero = a[0] * 0
+    answer = [zero] * (len(a) + len(b) - 1)
+
+    if len(a) >= 2 * len(b): # Very different lengths: Cut a into pieces of b's length
+        for start in range(0,len(a),len(b)):
+            for n,v in enumerate(_karatsuba(a[start:start + len(b)],b)):
+                answer[start + n] += v
+        return answer
+
+    half = len(a) // 2
+    a0, a1 = a[:half], a[half:]
+    b0, b1 = b[:half], b[half:]
+
+    z0 = _karatsuba(a0,b0)
+    z2 = _karatsuba(a1,b1) if b1 else []
+    a01 = [v + (a0[n] if n < len(a0) else zero) for n,v in enumerate(a1)]
+    b01 = [v + (b1[n] if n < len(b1) else zero) for n,v in enumerate(b0 + [zero] * max(0,len(b1) - len(b0)))]
+    z1 = _karatsuba(a01,b01)
+
+    for n,v in enumerate(z0):
+        answer[n] += v
+        z1[n] -= v
+    for n,v in enumerate(z2):
+        answer[2 * half + n] += v
+        z1[n] -= v
+    for n,v in enumerate(z1):
+        if half + n < len(answer):
+            answer[half + n] += v
+    return answer
+
+def _gf_karatsuba(a:GFArray,b:GFArray) -> np.ndarray:
+    """
+    Karatsuba multiplication in GF(2^m), additions are XORs of whole arrays.
+    Short pieces are multiplied as outer product.
+    :param a: Factors, LOWEST grade first
+    :param b: Factors, LOWEST grade first
+    :return: Plain array of factors, lowest grade first
+    """
+    if len(a) < len(b):
+        a, b = b, a
+
+    if len(b) <= 4 * GF_VECTOR_THRESHOLD: # Outer product, then XOR along the anti-diagonals
+        products = (a[:,None] * b[None,:]).view(np.ndarray)
+        skewed = np.zeros((len(b),len(a) + len(b) - 1),dtype=products.dtype)
+        np.lib.stride_tricks.as_strided(
+            skewed,
+            shape=(len(b),len(a)),
+            strides=(skewed.strides[0] + skewed.itemsize,skewed.itemsize),
+        )[...] = products.T
+        return np.bitwise_xor.reduce(skewed,axis=0)
+
+    answer = np.zeros(len(a) + len(b) - 1,dtype=a.dtype)
+
+    if len(a) >= 2 * len(b): # Very different lengths: Cut a into pieces of b's length
+        for start in range(0,len(a),len(b)):
+            piece = _gf_karatsuba(a[start:start + len(b)],b)
+            answer[start:start + len(piece)] ^= piece
+        return answer
+
+    half = len(a) // 2
+    a0, a1 = a[:half], a[half:]
+    b0, b1 = b[:half], b[half:]
+
+    z0 = _gf_karatsuba(a0,b0)
+    z2 = _gf_karatsuba(a1,b1) if len(b1) else np.zeros(0,dtype=a.dtype)
+
+    a01 = a1.copy()
+    a01[:half] ^= a0
+    b01 = GFArray(np.zeros(max(len(b0),len(b1)),dtype=a.dtype),a.field)
+    b01[:len(b0)] ^= b0
+    b01[:len(b1)] ^= b1
+    z1 = _gf_karatsuba(a01,b01)[:len(a) + len(b) - 1 - half]
+
+    z1[:len(z0)] ^= z0
+    z1[:len(z2)] ^= z2
+    answer[:len(z0)] ^= z0
+    answer[2 * half:2 * half + len(z2)] ^= z2
+    answer[half:half + len(z1)] ^= z1
+    return answer
+
+def _fft_convolve(a:list,b:list) -> list:
+    size = len(a) + len(b) - 1
+    fft_size = 1 << (size - 1).bit_length()
+    answer = np.fft.irfft(np.fft.rfft(a,fft_size) * np.fft.rfft(b,fft_size),fft_size)[:size]
+    return answer.tolist()
+
 @total_ordering
 class Polynomial:
     """
-    Polynomial of some grade
+    Polynomial of some grade.
+    GF(2^m) factors are stored packed as plain ints in an array (1 or 2 bytes per factor), other factor types in a list.
+    The in-place operators (+= -= *= <<=) change the polynomial itself instead of creating a new one.
     """
+    __slots__ = ("_vals","grade","val_type")
 
     def __init__(self,*vals:GFn|int,map_type:type=None):
         """
-        :param vals: Highest grade first
+        :param vals: Highest grade first. A single list, tuple or GFArray is also accepted.
         :param map_type: vals will be mapped to this type if given
         """
-        if vals and isinstance(vals[0],(list,tuple)):
+        if vals and isinstance(vals[0],GFArray):
+            vals = vals[0] if map_type is None else vals[0].elements()
+        elif vals and isinstance(vals[0],(list,tuple)):
             vals = vals[0]
 
         if map_type is not None:
             vals = map_list(map_type,vals)
 
-        self._vals:list
+        self._vals:list|array
 
         self.grade = -1 # -1, if Polynomial is empty (all factors 0)
         self.val_type:type|None = None
-        self.vals = list(vals)
+        self.vals = vals if isinstance(vals,GFArray) else list(vals)
+
+    @classmethod
+    def _from_raw(cls,raw:list|array,val_type:type,grade:int=None) -> Self:
+        """
+        Wraps already stored factors (packed array for GF(2^m)), without copying them
+        :param raw: Not used anywhere else afterwards
+        :param val_type:
+        :param grade: If it's known, otherwise it's searched
+        :return:
+        """
+        poly = cls.__new__(cls)
+        poly._vals = raw
+        poly.val_type = val_type
+        if grade is None:
+            poly._find_grade()
+        else:
+            poly.grade = grade
+        return poly
 
     @property
     def vals(self) -> list[int]:
         """
-
+        Factors, highest grade first.
+        For GF(2^m) factors, this is a new list of elements every time (they are stored packed),
+        but changing it in place (p.vals[i] = x, p.vals.append(x), ...) still changes the polynomial.
         :return:
         """
-        return self._vals
+        if type(self._vals) is list:
+            return self._vals
+        return _FactorList._of(self)
 
     @vals.setter
     def vals(self,new_vals:Iterable|list):
-        if not new_vals:
+        if not len(new_vals):
             self._vals = []
             self.grade = -1
             return
 
         # if self.mod: # (Done by GF objects)
         #     new_vals = list(map(lambda a:a % self.mod,new_vals))
-        self.val_type = type(new_vals[0])
+        if isinstance(new_vals,GFArray):
+            self.val_type = new_vals.field
+            self._vals = array(_typecode(self.val_type),new_vals.view(np.ndarray).tobytes())
+        else:
+            self.val_type = type(new_vals[0])
+            typecode = _typecode(self.val_type)
+            if typecode is not None:
+                try:
+                    self._vals = array(typecode,new_vals)
+                except OverflowError: # Negative or too big for the storage
+                    self._vals = None
+                if self._vals is None or max(self._vals) >= self.val_type.order:
+                    # Plain ints outside of the field mixed in, e.g. Polynomial(GF8(3), 300), are reduced into it
+                    self._vals = array(typecode,map(self.val_type,new_vals))
+            else:
+                self._vals = new_vals if type(new_vals) is list else list(new_vals)
+
+        self._find_grade()
+
+    def _find_grade(self,start:int = 0):
+        """
+        Sets grade by searching the first nonzero factor, starting at index start (everything before has to be 0)
+        """
+        vals = self._vals
+        for n in range(start,len(vals)):
+            if vals[n]:
+                self.grade = len(vals) - n - 1
+                return
+        self.grade = -1
+
+    def _top(self) -> list|array:
+        """
+        Copy of the stored factors from the leading one on
+        """
+        return self._vals[len(self._vals) - self.grade - 1:]
 
-        self._vals = new_vals
+    def _zeros(self,count:int) -> list|array:
+        """
+        count zero factors, stored like self's factors
+        """
+        if type(self._vals) is list:
+            return [self.val_type(0)] * count if count else []
+        return array(self._vals.typecode,bytes(count * self._vals.itemsize))
 
-        start_index = 0
-        for n, i in enumerate(new_vals):
-            if i:
-                start_index = n
-                break
-        else:
-            self.grade = -1
-            return
+    def _raw_like(self,other:Self) -> list|array:
+        """
+        Stored factors of other, converted to self's field if necessary
+        """
+        if other.val_type is self.val_type or type(self._vals) is list:
+            return other._vals
+        return array(self._vals.typecode,map(self.val_type,other.vals))
+
+    def _to_field(self,field:type):
+        """
+        Converts the factors (e.g. plain ints) into elements of field, like adding them to an element would do
+        """
+        self._vals = array(_typecode(field),map(field,self._vals))
+        self.val_type = field
+        self._find_grade()
 
-        self.grade = len(new_vals) - start_index - 1
+    def copy(self) -> Self:
+        """
+        Independent copy, e.g. before using the in-place operators
+        :return:
+        """
+        return self._from_raw(self._vals[:],self.val_type,self.grade)
 
     def to_grade(self,to_grade:int) -> Self:
         """
@@ -69,20 +355,16 @@ class Polynomial:
         :param to_grade: New grade
         :return:
         """
-        if len(self.vals) == to_grade:
+        if len(self._vals) == to_grade:
             return self
 
-        if len(self.vals) < to_grade:
-            new_vals = (
-                    [self.val_type(0) for _ in range(to_grade - len(self.vals))] +
-                    self.vals
-            )
-            return Polynomial(*new_vals)
+        if len(self._vals) < to_grade:
+            return self._from_raw(self._zeros(to_grade - len(self._vals)) + self._vals,self.val_type,self.grade)
 
-        return Polynomial(*(self.vals[-to_grade:]))
+        return self._from_raw(self._vals[-to_grade:],self.val_type,self.grade if self.grade < to_grade else None)
 
     def __len__(self):
-        return len(self.vals)
+        return len(self._vals)
 
     @staticmethod
     def _match_grades(p1,p2):
@@ -92,6 +374,9 @@ class Polynomial:
         :param p2:
         :return: p1, p2
         """
+        if not len(p1) or not len(p2): # Empty polynomials don't know their val_type
+            return p1 if len(p1) else p2.empty_like(), p2 if len(p2) else p1.empty_like()
+
         if len(p1) > len(p2):
             p2 = p2.to_grade(len(p1))
         elif len(p1) < len(p2):
@@ -104,85 +389,133 @@ class Polynomial:
         Returns a Polynomial of the same structure but filled with 0
         :return:
         """
-        return Polynomial(*[self.val_type(0) for _ in self])
+        return self._from_raw(self._zeros(len(self._vals)),self.val_type,-1)
 
     def __iter__(self):
-        return iter(self.vals)
+        if type(self._vals) is list:
+            return iter(self._vals)
+        return map(self.val_type._elements.__getitem__,self._vals)
 
     def __add__(self, other:"Polynomial") -> Self:
-        ssself,other = self._match_grades(self,other)
-
-        new_vals = list(map(sum, zip(ssself,other)))
-        return Polynomial(*new_vals)
+        answer = self.copy()
+        answer += other
+        return answer
 
     def __sub__(self, other:Self) -> Self:
-        ssself,other = self._match_grades(self,other)
+        answer = self.copy()
+        answer -= other
+        return answer
 
-        new_vals = list(map(lambda a:a[0] - a[1], zip(ssself,other)))
-        return Polynomial(*new_vals)
+    def __iadd__(self, other:Self) -> Self:
+        return self._add_in_place(other,False)
 
-    def __mul__(self, other:Self|int) -> Self:
-        if isinstance(other,(float,int,self.val_type)):
-            return Polynomial(*[i * other for i in self.vals])
+    def __isub__(self, other:Self) -> Self:
+        return self._add_in_place(other,True)
 
-        ssself,other = self._match_grades(self, other)
+    def _add_in_place(self,other:Self,subtract:bool) -> Self:
+        """
+        self += other or self -= other, the result is as long as the longer one of both
+        """
+        if not len(other):
+            return self
+        if not len(self._vals): # Empty polynomials don't know their val_type
+            self.val_type = other.val_type
+            self._vals = other._zeros(0)
+        elif _is_gf(other.val_type) and not _is_gf(self.val_type):
+            self._to_field(other.val_type)
+
+        theirs = self._raw_like(other)
+        their_grade = other.grade if theirs is other._vals else None
+        vals = self._vals
+        if len(theirs) > len(vals):
+            vals[:0] = self._zeros(len(theirs) - len(vals))
+        offset = len(vals) - len(theirs)
+
+        if type(vals) is not list: # GF(2^m): Adding and subtracting are both XOR
+            if len(theirs) >= GF_VECTOR_THRESHOLD:
+                dtype = _storage_dtype(self.val_type)
+                view = np.frombuffer(vals,dtype)
+                view[offset:] ^= np.frombuffer(theirs,dtype)
+                del view # vals can't be resized while it's viewed
+            else:
+                for n,v in enumerate(theirs,offset):
+                    if v:
+                        vals[n] ^= v
+        elif subtract:
+            for n,v in enumerate(theirs,offset):
+                vals[n] -= v
+        else:
+            for n,v in enumerate(theirs,offset):
+                vals[n] += v
+
+        # Only if both had the same grade, the leading factors can cancel out
+        if their_grade is None:
+            self._find_grade()
+        elif their_grade != self.grade:
+            self.grade = max(self.grade,their_grade)
+        else:
+            self._find_grade(len(vals) - self.grade - 1)
+        return self
 
-        summands = [
-            (other << n) * v1 for n,v1 in enumerate(ssself.vals[::-1]) if v1
-        ]
-        # for n,v1 in enumerate(ssself.vals[::-1]): # Same thing, just not list comprehension
-        #     if v1:
-        #         summands.append(other << n)
+    def __mul__(self, other:Self|int) -> Self:
+        if isinstance(other,(float,int)) or (self.val_type is not None and isinstance(other,self.val_type)):
+            return self._scaled(other)
 
-        if not summands:
+        if not self or not other:
             return self.empty_like()
 
-        cum_sum:Polynomial = summands[0]
-        for i in summands[1:]:
-            cum_sum = cum_sum + i
-        return cum_sum.shortened()
-
-    def __divmod__(self, other) -> (Self,Self):
-        """More like __floordivmod__"""
-        assert other, "Can't divide by an empty polynomial"
-
-        # Todo: Hier stimmt irgendwas gewaltig nicht
-        # Es funktioniert nur, wenn der Teiler existiert...
-
-        if other.grade > self.grade:
-            return Polynomial(),other
-
-        dividend:Self = self.shortened()
-        divisor = other.shortened() # dividend is divided by the divisor
-        quotient = list()
-
-        while dividend.grade >= divisor.grade:
-            break_after = False
-
-            eq = self.val_type(dividend.vals[0] / divisor.vals[0])
-            quotient.append(eq)
-            if not eq and dividend.vals[0]:
-                break_after = True
+        if _is_gf(other.val_type) and not _is_gf(self.val_type):
+            self, other = other, self
+
+        theirs = self._raw_like(other)
+        theirs = theirs[len(theirs) - other.grade - 1:]
+        return self._from_raw(_convolve(self._top(),theirs,self.val_type),self.val_type)
+
+    def __imul__(self, other:Self|int) -> Self:
+        if type(self._vals) is not list and isinstance(other,int):
+            field = self.val_type
+            other = field(other)
+            vals = self._vals
+            if not other:
+                vals[:] = self._zeros(len(vals))
+                self.grade = -1
+                return self
+
+            exp, log = field._exp, field._log
+            other_log = log[other]
+            for n,v in enumerate(vals):
+                if v:
+                    vals[n] = exp[log[v] + other_log]
+            return self
 
-            temp = (dividend.grade - divisor.grade)
-            temp = (divisor << temp)
-            temp = temp * eq
+        answer = self * other
+        self._vals, self.val_type, self.grade = answer._vals, answer.val_type, answer.grade
+        return self
 
-            dividend = dividend - temp
-            dividend = dividend.shortened()
+    def _scaled(self, factor:int|float) -> Self:
+        """
+        self * factor for a single factor
+        """
+        if type(self._vals) is list or not isinstance(factor,int):
+            return Polynomial(*[i * factor for i in self.vals])
 
-            if break_after:
-                # Due to val_type, no division can happen sometime.
-                # E.g.: If val_type == int and dividend[0] / divisor[0] == 0.5, eq = 0.
-                # This results in an endless loop, because dividend -= ... * eq = ... * 0.
-                break
+        answer = self.copy()
+        answer *= factor
+        return answer
 
-        return Polynomial(*quotient),dividend
+    def __divmod__(self, other:"Self|PreparedDivisor") -> (Self,Self):
+        """
+        More like __floordivmod__.
+        If you divide by the same polynomial a lot, pass a PreparedDivisor instead.
+        """
+        if not isinstance(other,PreparedDivisor):
+            other = PreparedDivisor(other)
+        return other.divmod(self)
 
-    def __floordiv__(self, other:Self) -> Self:
+    def __floordiv__(self, other:"Self|PreparedDivisor") -> Self:
         return divmod(self,other)[0]
 
-    def __mod__(self, other:Self) -> Self:
+    def __mod__(self, other:"Self|PreparedDivisor") -> Self:
         return divmod(self,other)[1]
 
     def __str__(self):
@@ -200,9 +533,22 @@ class Polynomial:
         :param other:
         :return:
         """
-        return Polynomial(*(
-            self.vals + [self.val_type(0) for _ in range(other)]
-        ))
+        return self._from_raw(self._vals + self._zeros(other),self.val_type,self.grade + other if self else -1)
+
+    def __rshift__(self, other:int) -> Self:
+        """
+        Divides by x ** other, dropping the remainder
+        :param other:
+        :return:
+        """
+        top = self._top()
+        return self._from_raw(top[:max(0,len(top) - other)],self.val_type,max(-1,self.grade - other))
+
+    def __ilshift__(self, other:int) -> Self:
+        self._vals.extend(self._zeros(other))
+        if self:
+            self.grade += other
+        return self
 
     def shortened(self):
         """
@@ -212,10 +558,10 @@ class Polynomial:
         if self.grade == -1:
             return Polynomial()
 
-        return Polynomial(*self.vals[-self.grade - 1:])
+        return self._from_raw(self._top(),self.val_type,self.grade)
 
     def __hash__(self) -> hash:
-        return hash(tuple(self.shortened().vals))
+        return hash(tuple(self._top()))
 
     def __eq__(self, other:Self) -> bool:
         """
@@ -223,7 +569,13 @@ class Polynomial:
         :param other:
         :return:
         """
-        return tuple(self.shortened().vals) == tuple(other.shortened().vals)
+        if not isinstance(other,Polynomial):
+            return tuple(self._top()) == tuple(other.shortened().vals)
+
+        mine, theirs = self._top(), other._top()
+        if type(mine) is type(theirs):
+            return mine == theirs
+        return tuple(mine) == tuple(theirs)
 
     def __bool__(self):
         return self.grade != -1
@@ -235,7 +587,7 @@ class Polynomial:
         if self.grade < other.grade: # Most common cases
             return False
 
-        for v1,v2 in zip(self.shortened(),other.shortened()):
+        for v1,v2 in zip(self._top(),other._top()):
             if abs(v1) > abs(v2):
                 return True
 
@@ -247,26 +599,489 @@ class Polynomial:
     def __call__(self, x_val:int) -> int:
         """
         Insert a numerical value into the polynomial-function
-        :param x_val: Value to be plottet in
+        :param x_val: Value to be plottet in. A GFArray evaluates at all of its values at once.
         :return:
         """
-        summands = [a * (x_val ** b) for b,a in enumerate(self.vals[::-1])]
-        return sum(summands)
+        if not self._vals:
+            return 0
+
+        if type(x_val) is self.val_type and type(self._vals) is not list: # Horner-scheme on the raw tables
+            field = self.val_type
+            if not x_val:
+                return field._elements[self._vals[-1]]
+
+            exp, log = field._exp, field._log
+            x_log = log[x_val]
+            answer = 0
+            for a in self._vals:
+                answer = (exp[log[answer] + x_log] if answer else 0) ^ a
+            return field._elements[answer]
+
+        vals = self.vals
+        answer = vals[0] # Horner-scheme
+        for a in vals[1:]:
+            answer = answer * x_val + a
+        return answer
+
+    def evaluate_many(self, points:Iterable|np.ndarray) -> GFArray|np.ndarray:
+        """
+        Inserts all points at once (vectorized Horner-scheme)
+        :param points: x values
+        :return: GFArray for GFn factors, np.ndarray otherwise
+        """
+        if not _is_gf(self.val_type):
+            return np.polyval(self.vals or [0],np.asarray(points))
 
-    def __pow__(self, power:int, modulo=None) -> Self:
-        if power == 0:
-            return Polynomial(self.val_type(1))
+        points = GFArray(points,self.val_type)
+        answer = points * 0
+        for a in self:
+            answer = answer * points + a
+        return answer
 
-        sol = self
+    def chien_search(self, block_size:int = 4096) -> np.ndarray:
+        """
+        Finds every i in 0 ... 2^m - 2 with self(alpha ** i) == 0 (only for GFn factors).
+        The terms c_j * alpha^(i*j) are stepped along i in the log-domain, block_size values of i at once.
+        :param block_size: Limits memory to about grade * block_size values
+        :return: Sorted array of i
+        """
+        assert _is_gf(self.val_type), "Chien search only works for GFn factors"
 
-        for _ in range(power - 1):
-            sol = sol * self
+        field = self.val_type
+        steps_total = field.order - 1
+        if not self:
+            return np.arange(steps_total)
 
-        return sol
+        factors = GFArray(np.frombuffer(self._vals,_storage_dtype(field))[::-1],field)
+        grades = np.flatnonzero(factors.view(np.ndarray))
+        logs = factors[grades].log()
+        alpha = GFArray(field.alpha(),field)
+
+        roots = []
+        for start in range(0,steps_total,block_size):
+            steps = np.arange(start,min(start + block_size,steps_total))
+            exponents = (logs[:,None] + grades[:,None] * steps[None,:]) % steps_total
+            values = np.bitwise_xor.reduce((alpha ** exponents).view(np.ndarray),axis=0)
+            roots.append(steps[values == 0])
+
+        return np.concatenate(roots)
+
+    def __pow__(self, power:int, modulo:Self=None) -> Self:
+        """
+        Square-and-multiply with a sliding window, so power can have hundreds of bits.
+        If modulo is given, every step is reduced by it, e.g. pow(x, 2 ** m, f) stays below f's grade.
+        :param power: >= 0
+        :param modulo: Polynomial (or PreparedDivisor) to reduce by
+        :return:
+        """
+        assert power >= 0, "Polynomials can't be raised to negative powers"
+
+        if modulo is not None and not isinstance(modulo,PreparedDivisor):
+            modulo = PreparedDivisor(modulo)
+
+        def reduce(p:Polynomial) -> Polynomial:
+            return p if modulo is None else modulo.mod(p)
+
+        if power == 0:
+            return reduce(Polynomial(self.val_type(1)))
+
+        base = reduce(self.shortened())
+        if power == 1:
+            return base
+
+        # Odd powers of base, the window is looked up in here
+        window = 1 if power.bit_length() <= 64 else 4
+        odd_powers = [base]
+        if window > 1: # A window of 1 only needs base itself
+            base_squared = reduce(base._square())
+            for _ in range((1 << (window - 1)) - 1):
+                odd_powers.append(reduce(odd_powers[-1] * base_squared))
+
+        bits = format(power,"b")
+        answer = None
+        i = 0
+        while i < len(bits):
+            if bits[i] == "0":
+                answer = reduce(answer._square())
+                i += 1
+                continue
+
+            j = min(i + window,len(bits)) # Longest window that ends with a 1
+            while bits[j - 1] == "0":
+                j -= 1
+
+            if answer is not None:
+                for _ in range(j - i):
+                    answer = reduce(answer._square())
+                answer = reduce(answer * odd_powers[int(bits[i:j],2) >> 1])
+            else:
+                answer = odd_powers[int(bits[i:j],2) >> 1]
+            i = j
+
+        return answer
+
+    def _square(self) -> Self:
+        """
+        self * self. In GF(2^m), squaring only squares every factor: (a*x + b)^2 = a^2*x^2 + b^2
+        :return:
+        """
+        if not _is_gf(self.val_type) or not self:
+            return self * self
+
+        exp, log = self.val_type._exp, self.val_type._log
+        new_vals = self._zeros(2 * self.grade + 1)
+        new_vals[::2] = array(new_vals.typecode,[exp[2 * log[i]] if i else 0 for i in self._top()])
+        return self._from_raw(new_vals,self.val_type,2 * self.grade)
 
     def __reversed__(self) -> Self:
-        return Polynomial(*(self.shortened().vals[::-1]))
+        return self._from_raw(self._top()[::-1],self.val_type)
+
+
+def _divide_factors(a:any,b:any) -> any:
+    """
+    a / b for factor types without GF-tables. Ints stay ints if the division is exact.
+    """
+    if isinstance(a,int) and isinstance(b,int) and not a % b:
+        return a // b
+    return a / b
+
+class PreparedDivisor:
+    """
+    Divisor of a polynomial long division with everything cached that doesn't depend on the dividend.
+    Use it to reduce many polynomials by the same one, e.g. messages mod a generator polynomial:
+        gen = PreparedDivisor(generator)
+        remainders = [message % gen for message in messages]
+    """
+
+    def __init__(self,divisor:Polynomial):
+        divisor = divisor.shortened()
+        assert divisor, "Can't divide by an empty polynomial"
+
+        self.divisor:Polynomial = divisor
+        self.val_type:type = divisor.val_type
+        self.grade:int = divisor.grade
+
+        vals = divisor._vals
+        self._is_gf = _is_gf(self.val_type)
+        self._typecode = _typecode(self.val_type)
+        if self._is_gf: # Only the logs are needed, the inner loop is just lookups and XORs
+            log = self.val_type._log
+            self._lead_inverse_log = (self.val_type.order - 1 - log[vals[0]]) % (self.val_type.order - 1)
+            self._lower = [(j,log[v]) for j,v in enumerate(vals[1:],1) if v]
+        else:
+            self._lead = vals[0]
+            self._lower = [(j,v) for j,v in enumerate(vals[1:],1) if v]
+        self._in_fields:dict[type,PreparedDivisor] = dict()
+
+    def _in_field(self,field:type) -> "PreparedDivisor":
+        """
+        The divisor converted into field, for GF dividends of a divisor with plain factors (like __mul__ does)
+        """
+        if field not in self._in_fields:
+            divisor = self.divisor.copy()
+            divisor._to_field(field)
+            self._in_fields[field] = PreparedDivisor(divisor)
+        return self._in_fields[field]
+
+    def _divide(self,dividend:Polynomial) -> tuple[list,int]:
+        """
+        Long division on a single buffer.
+        :return: buffer (quotient first, then remainder), length of the quotient
+        """
+        vals = dividend._top()
+        if self._is_gf and dividend.val_type is not self.val_type:
+            vals = list(map(self.val_type,vals))
+        quotient_len = len(vals) - self.grade
+        if quotient_len <= 0:
+            return vals, 0
+
+        if not self._is_gf:
+            buffer = list(vals)
+            for i in range(quotient_len):
+                if not (factor := buffer[i]):
+                    continue
+                factor = buffer[i] = _divide_factors(factor,self._lead)
+                for j,v in self._lower:
+                    buffer[i + j] -= factor * v
+            return buffer, quotient_len
+
+        field = self.val_type
+        exp, log = field._exp, field._log
+        cycle = field.order - 1
+        lead_inverse_log = self._lead_inverse_log
+        lower = self._lower
+
+        buffer = list(vals) # Plain ints, that's faster than indexing the packed array
+        for i in range(quotient_len):
+            if not (factor := buffer[i]):
+                continue
+            factor_log = log[factor] + lead_inverse_log
+            if factor_log >= cycle:
+                factor_log -= cycle
+            buffer[i] = exp[factor_log]
+            for j,l in lower:
+                buffer[i + j] ^= exp[factor_log + l]
+        return buffer, quotient_len
+
+    def divmod(self,dividend:Polynomial) -> tuple[Polynomial,Polynomial]:
+        """
+        :param dividend:
+        :return: dividend // divisor, dividend % divisor
+        """
+        if not self._is_gf and _is_gf(dividend.val_type):
+            return self._in_field(dividend.val_type).divmod(dividend)
+        buffer, quotient_len = self._divide(dividend)
+        if self._is_gf:
+            return (
+                Polynomial._from_raw(array(self._typecode,buffer[:quotient_len]),self.val_type),
+                Polynomial._from_raw(array(self._typecode,buffer[quotient_len:]),self.val_type).shortened(),
+            )
+        return Polynomial(*buffer[:quotient_len]), Polynomial(*buffer[quotient_len:]).shortened()
 
+    def mod(self,dividend:Polynomial) -> Polynomial:
+        """
+        :param dividend:
+        :return: dividend % divisor
+        """
+        if not self._is_gf and _is_gf(dividend.val_type):
+            return self._in_field(dividend.val_type).mod(dividend)
+        buffer, quotient_len = self._divide(dividend)
+        remainder = buffer[quotient_len:]
+        if self._is_gf:
+            return Polynomial._from_raw(array(self._typecode,remainder),self.val_type).shortened()
+        return Polynomial(*remainder).shortened()
+
+def _clmul(a:int,b:int) -> int:
+    """
+    Carry-less multiplication of two bitmask-polynomials over GF1
+    :return: a * b
+    """
+    if a.bit_length() < b.bit_length():
+        a, b = b, a
+
+    answer = 0
+    if b.bit_length() <= 128: # One shift-XOR per set bit of the shorter factor
+        shift = 0
+        while b:
+            if b & 1:
+                answer ^= a << shift
+            b >>= 1
+            shift += 1
+        return answer
+
+    multiples = [0,a] # multiples[i] == _clmul(a,i) for every byte i
+    for i in range(2,256):
+        multiples.append((multiples[i >> 1] << 1) ^ multiples[i & 1])
+
+    for n,byte in enumerate(b.to_bytes((b.bit_length() + 7) // 8,"little")):
+        if byte:
+            answer ^= multiples[byte] << (8 * n)
+    return answer
+
+@lru_cache(maxsize=64)
+def _cl_reduction_tables(divisor:int) -> tuple[list[int],list[int]]:
+    """
+    Tables to remove 8 leading bits at once when dividing by divisor
+    :return: quotient bytes and matching multiples of the divisor, both indexed by the 8 leading bits of the dividend
+    """
+    shift = divisor.bit_length() - 1
+    quotients = [0] * 256
+    multiples = [0] * 256
+    for q in range(256):
+        multiple = _clmul(q,divisor)
+        quotients[multiple >> shift] = q
+        multiples[multiple >> shift] = multiple
+    return quotients, multiples
+
+def _cl_divmod(a:int,b:int) -> tuple[int,int]:
+    """
+    Carry-less division of two bitmask-polynomials over GF1 by shift-XOR reduction
+    :return: a // b, a % b
+    """
+    grade_b = b.bit_length()
+    if not grade_b:
+        raise ZeroDivisionError("Can't divide by an empty polynomial")
+
+    quotient = 0
+    if a.bit_length() - grade_b > 64: # Byte-wise while it's worth building the tables
+        quotients, multiples = _cl_reduction_tables(b)
+        while (shift := a.bit_length() - grade_b - 7) >= 0:
+            top = a >> (shift + grade_b - 1)
+            a ^= multiples[top] << shift
+            quotient ^= quotients[top] << shift
+
+    while (shift := a.bit_length() - grade_b) >= 0:
+        a ^= b << shift
+        quotient ^= 1 << shift
+
+    return quotient, a
+
+@total_ordering
+class BinaryPolynomial:
+    """
+    Polynomial over GF1 with all factors packed into one int (bit i is the factor of x^i).
+    Works like Polynomial, but adding is XOR, multiplying is carry-less and dividing is shift-XOR reduction.
+    """
+    __slots__ = ("bits",)
+
+    val_type = GF1
+
+    def __init__(self,*vals:GFn|int,bits:int=None):
+        """
+        :param vals: Highest grade first, values are taken mod 2. A single list, tuple or GFArray is also accepted.
+        :param bits: Instead of vals, all factors as bitmask. E.g. 0b1011 is x^3 + x + 1
+        """
+        if bits is None:
+            if vals and isinstance(vals[0],(list,tuple,GFArray)):
+                vals = vals[0]
+            bits = int("".join("1" if int(i) & 1 else "0" for i in vals) or "0",2)
+
+        assert bits >= 0, "bits can't be negative"
+        self.bits:int = bits
+
+    @classmethod
+    def from_polynomial(cls,poly:"Polynomial") -> Self:
+        """
+        Packs a Polynomial (usually over GF1)
+        :param poly:
+        :return:
+        """
+        return cls(poly.vals)
+
+    def to_polynomial(self) -> "Polynomial":
+        """
+        Unpacks into a Polynomial over GF1
+        :return:
+        """
+        return Polynomial(*self.vals)
+
+    @property
+    def grade(self) -> int:
+        return self.bits.bit_length() - 1
+
+    @property
+    def vals(self) -> list[GFn]:
+        """
+        Factors as GF1, highest grade first
+        :return:
+        """
+        if not self.bits:
+            return []
+        return [GF1(i == "1") for i in format(self.bits,"b")]
+
+    def __len__(self):
+        return self.bits.bit_length()
+
+    def __iter__(self):
+        return iter(self.vals)
+
+    def __int__(self):
+        return self.bits
+
+    def empty_like(self) -> Self:
+        return BinaryPolynomial(bits=0)
+
+    def shortened(self) -> Self:
+        return self # Always as short as possible
+
+    def __add__(self, other:Self) -> Self:
+        if not isinstance(other,BinaryPolynomial):
+            return NotImplemented
+        return BinaryPolynomial(bits=self.bits ^ other.bits)
+
+    __sub__ = __add__
+
+    def __mul__(self, other:Self|int) -> Self:
+        if isinstance(other,int):
+            return BinaryPolynomial(bits=self.bits if other & 1 else 0)
+        if not isinstance(other,BinaryPolynomial):
+            return NotImplemented
+        return BinaryPolynomial(bits=_clmul(self.bits,other.bits))
+
+    __rmul__ = __mul__
+
+    def __divmod__(self, other:Self) -> (Self,Self):
+        assert other, "Can't divide by an empty polynomial"
+        quotient, remainder = _cl_divmod(self.bits,other.bits)
+        return BinaryPolynomial(bits=quotient), BinaryPolynomial(bits=remainder)
+
+    def __floordiv__(self, other:Self) -> Self:
+        return divmod(self,other)[0]
+
+    def __mod__(self, other:Self) -> Self:
+        assert other, "Can't divide by an empty polynomial"
+        return BinaryPolynomial(bits=_cl_divmod(self.bits,other.bits)[1])
+
+    def __lshift__(self, other:int) -> Self:
+        """
+        Multiplies by x ** other
+        :param other:
+        :return:
+        """
+        return BinaryPolynomial(bits=self.bits << other)
+
+    def __rshift__(self, other:int) -> Self:
+        """
+        Divides by x ** other, dropping the remainder
+        :param other:
+        :return:
+        """
+        return BinaryPolynomial(bits=self.bits >> other)
+
+    def __pow__(self, power:int, modulo:Self=None) -> Self:
+        assert power >= 0, "Polynomials can't be raised to negative powers"
+        mod_bits = None if modulo is None else modulo.bits
+        answer = 1
+        base = self.bits if mod_bits is None else _cl_divmod(self.bits,mod_bits)[1]
+
+        while power:
+            if power & 1:
+                answer = _clmul(answer,base)
+                if mod_bits is not None:
+                    answer = _cl_divmod(answer,mod_bits)[1]
+            power >>= 1
+            if power:
+                base = _clmul(base,base)
+                if mod_bits is not None:
+                    base = _cl_divmod(base,mod_bits)[1]
+
+        return BinaryPolynomial(bits=answer)
+
+    def __call__(self, x_val:int) -> int:
+        """
+        Insert a value into the polynomial-function
+        :param x_val: GF1/int, or an element (or GFArray) of a bigger field
+        :return:
+        """
+        if isinstance(x_val,(GFn,GFArray)) and x_val.__class__ is not GF1:
+            answer = x_val * 0
+            for i in format(self.bits,"b") if self.bits else ():
+                answer = answer * x_val + (i == "1")
+            return answer
+
+        if GF1(x_val):
+            return GF1(self.bits.bit_count())
+        return GF1(self.bits)
+
+    def __str__(self):
+        return f"<BinaryPoly: {bin(self.bits)} | Grade {self.grade}>"
+
+    def __hash__(self) -> hash:
+        return hash(self.bits)
+
+    def __eq__(self, other:Self) -> bool:
+        if not isinstance(other,BinaryPolynomial):
+            return NotImplemented
+        return self.bits == other.bits
+
+    def __bool__(self):
+        return bool(self.bits)
+
+    def __gt__(self, other:Self):
+        return self.bits > other.bits # Grade first, then factors from the top
+
+    def __reversed__(self) -> Self:
+        return BinaryPolynomial(bits=int(format(self.bits,"b")[::-1],2) if self.bits else 0)
 
 def polynomial_from_roots(*roots:int,map_type:type=None) -> Polynomial:
     """
@@ -276,13 +1091,178 @@ def polynomial_from_roots(*roots:int,map_type:type=None) -> Polynomial:
     :return:
     """
     if map_type is not None:
-        map_list(map_type,roots)
+        roots = map_list(map_type,roots) # So -i is the negative inside the field
+
+    if not roots:
+        return Polynomial(1,map_type=map_type)
+
+    factors = [Polynomial(1,-i,map_type=map_type) for i in roots]
+    while len(factors) > 1: # Multiply pairwise, so the big products can use the fast methods
+        factors = [
+            factors[i] * factors[i + 1] if i + 1 < len(factors) else factors[i]
+            for i in range(0,len(factors),2)
+        ]
 
-    poly = Polynomial(1,map_type=map_type)
-    for i in roots:
-        poly = poly * Polynomial(1,-i,map_type=map_type)
+    return factors[0]
 
-    return poly
+# 2x2 matrix of polynomials (m00, m01, m10, m11), maps (a, b) to (m00*a + m01*b, m10*a + m11*b)
+_Matrix = tuple[Polynomial,Polynomial,Polynomial,Polynomial]
+
+def _identity(val_type:type) -> _Matrix:
+    return Polynomial(val_type(1)), Polynomial(), Polynomial(), Polynomial(val_type(1))
+
+def _apply(matrix:_Matrix,a:Polynomial,b:Polynomial) -> tuple[Polynomial,Polynomial]:
+    m00, m01, m10, m11 = matrix
+    return m00 * a + m01 * b, m10 * a + m11 * b
+
+def _matrix_mul(m:_Matrix,n:_Matrix) -> _Matrix:
+    """
+    m * n, so n is applied first
+    """
+    return (
+        m[0] * n[0] + m[1] * n[2], m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2], m[2] * n[1] + m[3] * n[3],
+    )
+
+def _euclid_step(quotient:Polynomial,matrix:_Matrix) -> _Matrix:
+    """
+    One division step (a, b) -> (b, a - quotient * b) after matrix
+    """
+    m00, m01, m10, m11 = matrix
+    return m10, m11, m00 - quotient * m10, m01 - quotient * m11
+
+def _half_gcd(a:Polynomial,b:Polynomial) -> _Matrix:
+    """
+    Recursive part of half_gcd, grade of a > grade of b
+    """
+    m = (a.grade + 1) // 2
+    if b.grade < m:
+        return _identity(a.val_type)
+
+    if a.grade < HALF_GCD_THRESHOLD: # Plain Euclid is faster for short ones
+        matrix = _identity(a.val_type)
+        while b.grade >= m:
+            quotient, remainder = divmod(a,b)
+            a, b = b, remainder
+            matrix = _euclid_step(quotient,matrix)
+        return matrix
+
+    # The top halves have the same first quotients as a and b
+    matrix = _half_gcd(a >> m,b >> m)
+    a, b = _apply(matrix,a,b)
+    if b.grade < m:
+        return matrix
+
+    quotient, remainder = divmod(a,b)
+    a, b = b, remainder
+    matrix = _euclid_step(quotient,matrix)
+    if b.grade < m:
+        return matrix
+
+    k = 2 * m - a.grade
+    return _matrix_mul(_half_gcd(a >> k,b >> k),matrix)
+
+def half_gcd(a:Polynomial,b:Polynomial) -> tuple[tuple[Polynomial,Polynomial],tuple[Polynomial,Polynomial]]:
+    """
+    Jumps to the middle of the Euclidean algorithm on a and b in O(M(n) log n) instead of O(n^2),
+    where M(n) is the cost of a multiplication (Karatsuba for long GF(2^m) polynomials).
+    The quotients are found from the top halves of the polynomials only, recursively.
+
+    Returns the matrix ((s0, t0), (s1, t1)) of two consecutive remainders of the Euclidean algorithm:
+        r0 = s0 * a + t0 * b with grade >= ceil(grade(a) / 2)
+        r1 = s1 * a + t1 * b with grade <  ceil(grade(a) / 2)
+    :param a:
+    :param b: Lower grade than a
+    :return: ((s0, t0), (s1, t1))
+    """
+    a, b = a.shortened(), b.shortened()
+    assert a.grade > b.grade, "b has to have a lower grade than a"
+    m00, m01, m10, m11 = _half_gcd(a,b)
+    return (m00, m01), (m10, m11)
+
+def _remainders(a:Polynomial,b:Polynomial,stop_grade:int) -> tuple[Polynomial,Polynomial,_Matrix]:
+    """
+    Euclidean algorithm on a and b until the first remainder below stop_grade, with half_gcd for the long parts
+    :return: The remainder before, that remainder, matrix (first row are the cofactors of the one before)
+    """
+    val_type = a.val_type if a.val_type is not None else b.val_type
+    matrix = _identity(val_type)
+    a, b = a.shortened(), b.shortened()
+
+    while b.grade >= stop_grade:
+        if a.grade >= HALF_GCD_THRESHOLD and a.grade > b.grade:
+            # Only the top parts decide the quotients down to stop_grade
+            k = max(0,2 * stop_grade - a.grade)
+            step = _half_gcd(a >> k,b >> k)
+            if step[1]: # Not the identity
+                a, b = _apply(step,a,b)
+                matrix = _matrix_mul(step,matrix)
+                continue
+
+        quotient, remainder = divmod(a,b)
+        a, b = b, remainder
+        matrix = _euclid_step(quotient,matrix)
+
+    return a, b, matrix
+
+def _leading_factor(p:Polynomial):
+    return p.shortened().vals[0]
+
+def poly_xgcd(a:Polynomial,b:Polynomial,stop_grade:int = None) -> tuple[Polynomial,Polynomial,Polynomial]:
+    """
+    Extended Euclidean algorithm: r, s, t with s * a + t * b == r.
+    Without stop_grade, r is the monic greatest common divisor.
+
+    With stop_grade, it stops at the first remainder (a and b included) with a grade below stop_grade,
+    which is not made monic. E.g. the key equation of RS/BCH decoding with 2t syndromes S (Sugiyama):
+        evaluator, _, locator = poly_xgcd(Polynomial(1) << 2 * t, S, stop_grade=t)
+    The coefficients have to be from a field (GF(2^m), Fraction, float with rounding errors).
+    :param a:
+    :param b:
+    :param stop_grade: Grade the remainder has to be below, None for the gcd
+    :return: r, s, t
+    """
+    val_type = a.val_type if a.val_type is not None else b.val_type
+    if stop_grade is not None and a.grade < stop_grade:
+        return a.shortened(), Polynomial(val_type(1)), Polynomial()
+
+    gcd, remainder, (s0, t0, s1, t1) = _remainders(a,b,0 if stop_grade is None else stop_grade)
+    if stop_grade is not None:
+        return remainder, s1, t1
+
+    # The remainder is 0 now, the gcd is the one before
+    if not gcd:
+        return gcd, s0, t0
+    inverse = 1 / _leading_factor(gcd)
+    return gcd * inverse, s0 * inverse, t0 * inverse
+
+def poly_gcd(a:Polynomial,b:Polynomial) -> Polynomial:
+    """
+    Monic greatest common divisor
+    :param a:
+    :param b:
+    :return:
+    """
+    if max(a.grade,b.grade) >= HALF_GCD_THRESHOLD:
+        return poly_xgcd(a,b)[0]
+
+    a, b = a.shortened(), b.shortened()
+    while b:
+        a, b = b, a % b
+    if not a:
+        return a
+    return a * (1 / _leading_factor(a))
+
+def poly_inverse(a:Polynomial,modulo:Polynomial) -> Polynomial:
+    """
+    Inverse of a mod modulo, so (a * poly_inverse(a, modulo)) % modulo == 1
+    :param a:
+    :param modulo:
+    :return:
+    """
+    gcd, inverse, _ = poly_xgcd(a % modulo,modulo)
+    assert gcd.grade == 0, "a and modulo have a common factor, there is no inverse"
+    return inverse % modulo
 
 # print(type(not None))
 #
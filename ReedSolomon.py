@@ -0,0 +1,234 @@
+import numpy as np
+
+from GaloisFields import GF8, GFArray
+from Polynomials import Polynomial, polynomial_from_roots
+
+class RSEncoder:
+    """
+    Systematic Reed-Solomon encoder for whole batches of messages.
+    Codewords are the message followed by n - k parity symbols, which can correct up to (n - k) // 2 symbol errors.
+
+    The generator polynomial is (x - alpha^first_root) * ... * (x - alpha^(first_root + n - k - 1)).
+    Encoding runs the usual LFSR, but for all messages at once:
+    Every step adds one precomputed table-row (feedback * generator) to each parity register.
+    """
+
+    def __init__(self,n:int,k:int,field:type = GF8,first_root:int = 0):
+        """
+        :param n: Symbols per codeword, up to 2^m - 1 (smaller n gives a shortened code)
+        :param k: Message symbols per codeword
+        :param field: Symbol type, e.g. GF8 for bytes
+        :param first_root: Exponent of the first root of the generator polynomial
+        """
+        assert 0 < k < n < field.order, f"Needs 0 < k < n < {field.order}"
+
+        self.n = n
+        self.k = k
+        self.field = field
+        self.first_root = first_root
+
+        alpha = field.alpha()
+        self.generator:Polynomial = polynomial_from_roots(
+            *[alpha ** (first_root + i) for i in range(n - k)],
+            map_type=field,
+        )
+
+        # feedback_rows[f] == f * generator (without its leading 1), one row per possible feedback value f
+        lower = GFArray(self.generator.vals[1:],field)
+        self._feedback_rows:np.ndarray = (GFArray(np.arange(field.order),field)[:,None] * lower[None,:]).view(np.ndarray)
+
+    @property
+    def parity_count(self) -> int:
+        return self.n - self.k
+
+    def encode(self,messages:np.ndarray|GFArray|bytes) -> GFArray:
+        """
+        Encodes a batch of messages
+        :param messages: (N, k)-array of symbols, or a single message of length k
+        :return: (N, n)-GFArray of codewords, (n,) if a single message was passed
+        """
+        if isinstance(messages,(bytes,bytearray,memoryview)):
+            messages = np.frombuffer(messages,dtype=np.uint8)
+        messages = GFArray(messages,self.field).view(np.ndarray)
+
+        single = messages.ndim == 1
+        if single:
+            messages = messages[None,:]
+        assert messages.shape[-1] == self.k, f"Messages need {self.k} symbols"
+
+        parity = np.zeros((len(messages),self.parity_count),dtype=messages.dtype)
+        feedback_rows = self._feedback_rows
+        for column in np.ascontiguousarray(messages.T):
+            feedback = column ^ parity[:,0]
+            parity[:,:-1] = parity[:,1:]
+            parity[:,-1] = 0
+            parity ^= feedback_rows[feedback]
+
+        codewords = GFArray(np.concatenate([messages,parity],axis=1),self.field)
+        return codewords[0] if single else codewords
+
+    def encode_bytes(self,data:bytes) -> GFArray:
+        """
+        Cuts a payload into messages (the last one padded with zeros) and encodes them. Only for fields up to GF8.
+        :param data:
+        :return: (N, n)-GFArray of codewords
+        """
+        assert self.field.m <= 8, "Bytes can only be used as symbols of fields up to GF8"
+        data = np.frombuffer(data,dtype=np.uint8)
+        padded = np.zeros(-(-len(data) // self.k) * self.k,dtype=np.uint8)
+        padded[:len(data)] = data
+        return self.encode(padded.reshape(-1,self.k))
+
+class RSDecoder:
+    """
+    Reed-Solomon decoder for whole batches of received codewords (matching RSEncoder with the same parameters).
+
+    All syndromes are calculated at once with precomputed tables. Codewords with only zero syndromes are clean,
+    which is by far the most common case, so they cost nothing else.
+    Only the dirty ones go through Berlekamp-Massey, Chien search and Forney.
+    """
+
+    def __init__(self,n:int,k:int,field:type = GF8,first_root:int = 0):
+        """
+        :param n: Symbols per codeword
+        :param k: Message symbols per codeword
+        :param field: Symbol type
+        :param first_root: Exponent of the first root of the generator polynomial (same as for the encoder)
+        """
+        assert 0 < k < n < field.order, f"Needs 0 < k < n < {field.order}"
+
+        self.n = n
+        self.k = k
+        self.field = field
+        self.first_root = first_root
+
+        # Symbol j belongs to x^(n - 1 - j), syndrome i is the codeword at alpha^(first_root + i)
+        exponents = np.outer(np.arange(n - 1,-1,-1),first_root + np.arange(n - k)) % (field.order - 1)
+        self._syndrome_matrix = GFArray(field.alpha(),field) ** exponents # (n, n - k)
+
+        self._syndrome_rows = None
+        if field.order <= 256: # syndrome_rows[j, v] == v * row j of the syndrome matrix
+            values = GFArray(np.arange(field.order),field)
+            self._syndrome_rows = (values[None,:,None] * self._syndrome_matrix[:,None,:]).view(np.ndarray)
+
+    @property
+    def max_errors(self) -> int:
+        """
+        How many symbol errors can be corrected per codeword
+        """
+        return (self.n - self.k) // 2
+
+    def syndromes(self,received:np.ndarray|GFArray) -> GFArray:
+        """
+        :param received: (N, n)-array of codewords
+        :return: (N, n - k)-GFArray, all zero for valid codewords
+        """
+        received = GFArray(received,self.field)
+        if self._syndrome_rows is None:
+            return received @ self._syndrome_matrix
+
+        plain = received.view(np.ndarray)
+        answer = np.zeros((len(plain),self.n - self.k),dtype=plain.dtype)
+        for rows,column in zip(self._syndrome_rows,np.ascontiguousarray(plain.T)):
+            answer ^= rows[column]
+        return GFArray(answer,self.field)
+
+    def decode(self,received:np.ndarray|GFArray) -> tuple[GFArray,np.ndarray]:
+        """
+        Corrects a batch of received codewords
+        :param received: (N, n)-array of codewords, or a single codeword of length n
+        :return: messages as (N, k)-GFArray, corrected symbols per codeword (-1 if it couldn't be corrected)
+        """
+        received = GFArray(received,self.field)
+        single = received.ndim == 1
+        if single:
+            received = received[None,:]
+        assert received.shape[-1] == self.n, f"Codewords need {self.n} symbols"
+
+        syndromes = self.syndromes(received)
+        dirty = np.flatnonzero(syndromes.view(np.ndarray).any(axis=1))
+
+        corrected = np.zeros(len(received),dtype=np.int64)
+        messages = received[:,:self.k].copy()
+        for i in dirty:
+            positions, magnitudes = self._locate_errors(syndromes[i].elements())
+            if positions is None:
+                corrected[i] = -1
+                continue
+
+            corrected[i] = len(positions)
+            message_errors = positions < self.k
+            messages[i,positions[message_errors]] ^= magnitudes[message_errors]
+
+        if single:
+            return messages[0], corrected[0]
+        return messages, corrected
+
+    def _locate_errors(self,syndromes:list) -> tuple[np.ndarray|None,GFArray|None]:
+        """
+        Berlekamp-Massey, Chien search and Forney for one codeword
+        :param syndromes: Syndromes as field elements
+        :return: error positions (index in the codeword) and error values, or None, None if uncorrectable
+        """
+        field = self.field
+        one, zero = field(1), field(0)
+
+        # Berlekamp-Massey, factor lists lowest grade first
+        locator, previous = [one], [one]
+        errors, shift, previous_discrepancy = 0, 1, one
+        for r,syndrome in enumerate(syndromes):
+            discrepancy = syndrome
+            for i in range(1,errors + 1):
+                discrepancy += locator[i] * syndromes[r - i]
+
+            if not discrepancy:
+                shift += 1
+                continue
+
+            scale = discrepancy / previous_discrepancy
+            new_locator = locator + [zero] * max(0,len(previous) + shift - len(locator))
+            for i,v in enumerate(previous):
+                new_locator[i + shift] -= scale * v
+
+            if 2 * errors <= r:
+                previous, previous_discrepancy = locator, discrepancy
+                errors = r + 1 - errors
+                shift = 1
+            else:
+                shift += 1
+            locator = new_locator
+
+        if errors > self.max_errors:
+            return None, None
+
+        # Chien search: locator(alpha^i) == 0 -> error at x^(-i)
+        roots = Polynomial(*locator[::-1]).chien_search()
+        if len(roots) != errors:
+            return None, None
+        grades = (-roots) % (field.order - 1)
+        if np.any(grades >= self.n): # Outside of a shortened code
+            return None, None
+
+        # Forney: e = X^(1 - first_root) * evaluator(1/X) / locator'(1/X)
+        evaluator = [zero] * len(syndromes)
+        for i,s in enumerate(syndromes):
+            if s:
+                for j,l in enumerate(locator[:len(syndromes) - i]):
+                    evaluator[i + j] += s * l
+        evaluator = Polynomial(*evaluator[::-1])
+        derivative = Polynomial(*[v if i % 2 else zero for i,v in enumerate(locator)][:0:-1])
+
+        alpha = field.alpha()
+        magnitudes = []
+        for grade in grades.tolist():
+            x = alpha ** grade
+            x_inverse = x.inverse()
+            denominator = derivative(x_inverse)
+            if not denominator:
+                return None, None
+            magnitude = x ** (1 - self.first_root) * evaluator(x_inverse) / denominator
+            if not magnitude:
+                return None, None
+            magnitudes.append(magnitude)
+
+        return self.n - 1 - grades, GFArray(magnitudes,field)
@@ -0,0 +1,198 @@
+import os
+from statistics import NormalDist
+
+import numpy as np
+
+# Roughly how many errors are generated at once per worker. Keeps memory low, independent of the block count.
+CHUNK_ERRORS = 1 << 22
+
+def error_positions(rng:np.random.Generator,errorRate:float,symbols:int) -> np.ndarray:
+    """
+    Positions of the erroneous symbols in a stream of i.i.d. symbols.
+    Instead of drawing every symbol, the gaps between errors are drawn (geometric distribution),
+    so the cost only depends on the number of errors.
+    :param rng: Random generator
+    :param errorRate: Single symbol error probability
+    :param symbols: Length of the stream
+    :return: Sorted positions
+    """
+    if errorRate <= 0 or symbols <= 0:
+        return np.zeros(0,dtype=np.int64)
+    if errorRate >= 1:
+        return np.arange(symbols,dtype=np.int64)
+
+    expected = symbols * errorRate
+    size = int(expected + 5 * expected ** 0.5 + 16)
+    positions = np.cumsum(rng.geometric(errorRate,size)) - 1
+    while positions[-1] < symbols:
+        positions = np.concatenate([positions,positions[-1] + np.cumsum(rng.geometric(errorRate,size))])
+    return positions[:np.searchsorted(positions,symbols)]
+
+def error_histogram(rng:np.random.Generator,errorRate:float,n:int,blocks:int) -> np.ndarray:
+    """
+    Simulates blocks of n symbols and counts how many blocks had k errors
+    :param rng: Random generator
+    :param errorRate: Single symbol error probability
+    :param n: Symbols per block
+    :param blocks: Number of blocks
+    :return: histogram[k] == number of blocks with k errors
+    """
+    histogram = np.zeros(1,dtype=np.int64)
+    chunk_blocks = max(1,int(CHUNK_ERRORS / max(n * errorRate,1e-300)))
+    while blocks > 0:
+        chunk = min(blocks,chunk_blocks)
+        blocks -= chunk
+
+        block_of_error = error_positions(rng,errorRate,chunk * n) // n
+        if not len(block_of_error):
+            histogram[0] += chunk
+            continue
+
+        # Errors are sorted, so each block's errors are one run
+        borders = np.flatnonzero(np.diff(block_of_error)) + 1
+        counts = np.diff(np.concatenate([[0],borders,[len(block_of_error)]]))
+
+        chunk_histogram = np.bincount(counts)
+        chunk_histogram[0] = chunk - len(counts)
+        histogram = _add_histograms(histogram,chunk_histogram)
+
+    return histogram
+
+def _add_histograms(a:np.ndarray,b:np.ndarray) -> np.ndarray:
+    if len(a) < len(b):
+        a, b = b, a
+    a = a.copy()
+    a[:len(b)] += b
+    return a
+
+def _histogram_part(errorRate:float,n:int,blocks:int,seed:np.random.SeedSequence) -> np.ndarray:
+    """
+    Runs in the worker processes
+    """
+    return error_histogram(np.random.default_rng(seed),errorRate,n,blocks)
+
+def simulate_histogram(
+        errorRate:float,
+        n:int,
+        blocks:int,
+        processes:int = None,
+        seed:int = None,
+) -> np.ndarray:
+    """
+    error_histogram, split over a process pool.
+    Every part gets its own independent stream spawned from seed,
+    so results are reproducible for the same seed and number of processes.
+    :param errorRate: Single symbol error probability
+    :param n: Symbols per block
+    :param blocks: Number of blocks
+    :param processes: Number of worker processes, None for one per CPU core, 1 to stay in this process
+    :param seed: Seed for np.random.SeedSequence, None for a random one
+    :return: histogram[k] == number of blocks with k errors
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1,min(processes,blocks))
+
+    seeds = np.random.SeedSequence(seed).spawn(processes)
+    if processes == 1:
+        return _histogram_part(errorRate,n,blocks,seeds[0])
+
+    parts = [blocks // processes + (i < blocks % processes) for i in range(processes)]
+    histogram = np.zeros(1,dtype=np.int64)
+    from concurrent.futures import ProcessPoolExecutor # Only imported when needed, it's slow to import
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for part in pool.map(_histogram_part,[errorRate] * processes,[n] * processes,parts,seeds):
+            histogram = _add_histograms(histogram,part)
+    return histogram
+
+def _wilson(successes:float,trials:int,z:float) -> tuple[float,float]:
+    """
+    Wilson score interval, which stays useful when there are (almost) no successes
+    """
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    spread = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0,center - spread), min(1.0,center + spread)
+
+def simulate_table(
+        errorRate:float,
+        n:int,
+        blocks:int,
+        k_max:int,
+        k_min:int = 0,
+        biased_rate:float = None,
+        confidence:float = 0.95,
+        processes:int = None,
+        seed:int = None,
+        rounding = 100,
+        to_array:bool = False,
+) -> list[list] | np.ndarray:
+    """
+    Monte Carlo version of Calculations.get_table, to check the analytic values.
+
+    A "table row" contains the same as in get_table, followed by the confidence intervals:
+        k, P(k), P(<=k), P(>k), 1 // P(>k),
+        P(k) lower bound, P(k) upper bound, P(>k) lower bound, P(>k) upper bound
+
+    Importance sampling:
+    Rare events (e.g. P(>k) around 1e-9) would need billions of blocks.
+    With biased_rate, errors are simulated with that (higher) rate instead, and every block is weighted back
+    by its likelihood ratio. A biased_rate of about (k + 1) / n works well for estimating P(>k).
+
+    :param errorRate: Single symbol error probability
+    :param n: Symbols per block
+    :param blocks: Number of simulated blocks
+    :param k_max: last k to be considered
+    :param k_min: first k to be considered
+    :param biased_rate: Error rate used for importance sampling, None to simulate errorRate directly
+    :param confidence: Confidence level of the intervals
+    :param processes: Number of worker processes, None for one per CPU core
+    :param seed: Seed for reproducible results
+    :param rounding: How many decimal points to be rounded to
+    :param to_array: True, if return should be converted to np.array
+    :return: (Detailed description in docstring)
+    """
+    assert blocks > 0, "At least one block has to be simulated"
+    simulated_rate = errorRate if biased_rate is None else biased_rate
+    histogram = simulate_histogram(simulated_rate,n,blocks,processes,seed).astype(np.float64)
+    histogram = np.pad(histogram,(0,max(0,k_max + 2 - len(histogram))))
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    k_all = np.arange(len(histogram))
+    if biased_rate is None:
+        weights = np.ones(len(histogram))
+    else:
+        weights = np.exp(
+            k_all * (np.log(errorRate) - np.log(biased_rate))
+            + (n - k_all) * (np.log1p(-errorRate) - np.log1p(-biased_rate))
+        )
+
+    # Estimates per k and for the tails (k' > k), with their second moments for the standard error
+    P_k = histogram * weights / blocks
+    P_k_squared = histogram * weights ** 2 / blocks
+    tails = np.cumsum(P_k[::-1])[::-1] - P_k
+    tails_squared = np.cumsum(P_k_squared[::-1])[::-1] - P_k_squared
+
+    def interval(estimate:float,second_moment:float,count:float) -> tuple[float,float]:
+        if biased_rate is None:
+            return _wilson(count,blocks,z)
+        spread = z * np.sqrt(max(0.0,second_moment - estimate ** 2) / blocks)
+        return max(0.0,estimate - spread), min(1.0,estimate + spread)
+
+    table = list()
+    for k in range(k_min,k_max + 1):
+        tail = min(1.0,tails[k])
+        table.append([
+            k,
+            np.round(P_k[k],rounding),
+            np.round(1 - tail,rounding),
+            np.round(tail,rounding),
+            np.round(1 / tail) if tail else np.inf,
+            *np.round(interval(P_k[k],P_k_squared[k],histogram[k]),rounding),
+            *np.round(interval(tails[k],tails_squared[k],histogram[k + 1:].sum()),rounding),
+        ])
+
+    if to_array:
+        return np.array(table)
+    return table
@@ -3,6 +3,8 @@ import numpy as np
 
 import Calculations as calc
 from functools import partial
+import threading
+import time
 
 # Main layout
 # Start here if you are running as a python script
@@ -126,23 +128,14 @@ def array_to_formatted_list(array:np.ndarray,to_type:"callable|type" = float) ->
     """
     return list(map(to_type,array))
 
-def refresh_table(w,_,v):
+def calculate_table(err_rate:float,num_symbols:int,max_k:int) -> list[tuple]:
     """
-    Refreshes the main table
-    :param w:
-    :param v:
+    Calculates the rows of the main table, already formatted
+    :param err_rate:
+    :param num_symbols:
+    :param max_k:
     :return:
     """
-    num_symbols = 0 # So the IDE doesn't complain...
-    max_k = 0
-
-    if not (
-        (err_rate := to_float(v["SymbolErrorRate"],0)) and
-        (num_symbols := to_int(v["NumSymbols"], 0)) and
-        (max_k := to_int(v["MaxErrorcount"], 0))
-    ):
-        return
-
     calculated:np.ndarray = calc.get_table(
         err_rate,
         num_symbols,
@@ -158,9 +151,115 @@ def refresh_table(w,_,v):
         array_to_formatted_list(calculated[3]),
         array_to_formatted_list(calculated[4], lambda a:f"{int(a):_}"),
     ]
-    formatted = list(zip(*formatted)) # Transpose for non-Numpy fans
+    return list(zip(*formatted)) # Transpose for non-Numpy fans
+
+DEBOUNCE_SECONDS = 0.15 # Waits for the user to stop typing before calculating
+TABLE_EVENT = "tableCalculated"
+
+class TableWorker:
+    """
+    Calculates the main table in a background thread, so the window never freezes.
+
+    Every keystroke submits a request, but only the newest one is calculated,
+    once there was no newer one for DEBOUNCE_SECONDS.
+    Results of requests that were superseded while calculating are dropped.
+    Finished tables are sent to the event loop with write_event_value.
+    """
+
+    def __init__(self,w:sg.Window):
+        self._window = w
+        self._condition = threading.Condition()
+        self._request:tuple|None = None # generation, arguments, time of submission
+        self._stopped = False
+        self.generation = 0 # Increased with every request, the newest one is the only one that counts
+
+        self._thread = threading.Thread(target=self._run,daemon=True)
+        self._thread.start()
+
+    def submit(self,*args):
+        """
+        Requests a new table, see calculate_table for the arguments
+        :param args:
+        :return:
+        """
+        with self._condition:
+            self.generation += 1
+            self._request = (self.generation,args,time.monotonic())
+            self._condition.notify()
+
+    def is_current(self,generation:int) -> bool:
+        with self._condition:
+            return generation == self.generation
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._request is None and not self._stopped:
+                    self._condition.wait()
+
+                while not self._stopped: # Debounce, newer requests restart the waiting time
+                    generation, args, submitted = self._request
+                    remaining = submitted + DEBOUNCE_SECONDS - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                if self._stopped:
+                    return
+                self._request = None
+
+            try:
+                result = calculate_table(*args)
+            except Exception as ex: # Any uncaught one would end the thread and every later request would be ignored
+                result = ex
+
+            if self.is_current(generation):
+                self._window.write_event_value(TABLE_EVENT,(generation,result))
+
+table_worker:TableWorker|None = None
+
+def refresh_table(w,_,v):
+    """
+    Refreshes the main table (in the background, the last table stays visible until then)
+    :param w:
+    :param v:
+    :return:
+    """
+    num_symbols = 0 # So the IDE doesn't complain...
+    max_k = 0
+
+    if not (
+        (err_rate := to_float(v["SymbolErrorRate"],0)) and
+        (num_symbols := to_int(v["NumSymbols"], 0)) and
+        (max_k := to_int(v["MaxErrorcount"], 0))
+    ):
+        return
+
+    w["computing"]("computing...")
+    table_worker.submit(err_rate,num_symbols,max_k)
 
-    w["mainTable"](formatted)
+def show_table(w,v):
+    """
+    Puts a table from the TableWorker into the window, if it is still the newest one
+    :param w:
+    :param v:
+    :return:
+    """
+    generation, result = v[TABLE_EVENT]
+    if not table_worker.is_current(generation):
+        return
+
+    if isinstance(result,Exception):
+        w["computing"](f"failed: {type(result).__name__}: {result}")
+        return
+
+    w["mainTable"](result)
+    w["computing"]("")
 
 def main():
 
@@ -171,7 +270,9 @@ def main():
         layout_oneLine("Symbol-count:", "NumSymbols",default_text=1000,enable_events=True) +
         layout_oneLine("Bits per symbol:","BitsPerSymbol",default_text=8,enable_events=True),
         #layout_numberButtons("NumSymbols",int,refresh_table),
-        layout_oneLine("Max error Count:","MaxErrorcount",default_text=10,enable_events=True),
+        layout_oneLine("Max error Count:","MaxErrorcount",default_text=10,enable_events=True) + [
+            sg.T("",key="computing",size=(30,0)),
+        ],
         #layout_numberButtons("MaxErrorcount",int,refresh_table),
         [
             sg.Table(
@@ -187,6 +288,9 @@ def main():
 
     w = sg.Window("Channel Coding Utility",layout=layout,finalize=True)
 
+    global table_worker
+    table_worker = TableWorker(w)
+
     e,v = w.read(timeout=10)
 
     refresh_table(w,e,v)
@@ -197,9 +301,14 @@ def main():
         e,v = w.read()
 
         if e is None:
+            table_worker.stop()
             w.close()
             break
 
+        if e == TABLE_EVENT:
+            show_table(w,v)
+            continue
+
         print(e)
 
         if callable(e): # So you can do calls just from the key
@@ -9,27 +9,6 @@ def bin_len(theBin) -> int:
         theBin >>= 1
     return counter
 
-# data = [
-#     0b10010111,
-#     0b00111110,
-#     0b10010111,
-#     0b00111110,
-#     0
-# ]
-
-#data = [r.randint(0,255) for _ in range(100)] + [0]
-
-data = "Hallo Welt"
-data = list(map(ord,data))
-
-gen = 0b10000111
-
-print(data)
-print("Data-stream:",bin(sum([
-    i << 8 * n for n,i in enumerate(data[::-1])
-])))
-print("Generator:",bin(gen))
-
 def poly_mod(dasPoly,durch):
 
     durch <<= 8
@@ -44,12 +23,32 @@ def poly_mod(dasPoly,durch):
 
     return dasPoly
 
-mod = data[0]
-for i in data[1:]:
-    nextNum = (mod << 8) + i
-    nextNum &= (1 << 16) - 1
-    mod = poly_mod(nextNum, gen)
+if __name__ == "__main__":
+    # data = [
+    #     0b10010111,
+    #     0b00111110,
+    #     0b10010111,
+    #     0b00111110,
+    #     0
+    # ]
+
+    #data = [r.randint(0,255) for _ in range(100)] + [0]
+
+    data = "Hallo Welt"
+    data = list(map(ord,data))
+
+    gen = 0b10000111
 
-print("Modulo:",mod)
+    print(data)
+    print("Data-stream:",bin(sum([
+        i << 8 * n for n,i in enumerate(data[::-1])
+    ])))
+    print("Generator:",bin(gen))
 
+    mod = data[0]
+    for i in data[1:]:
+        nextNum = (mod << 8) + i
+        nextNum &= (1 << 16) - 1
+        mod = poly_mod(nextNum, gen)
 
+    print("Modulo:",mod)